@@ -10,6 +10,7 @@ Available Agents:
 - DraftWriterAgent: Generates email body based on intent
 - ToneStylistAgent: Adjusts email tone while preserving content
 - PersonalizationAgent: Injects user-specific data
+- FusedStyleAgent: Tone adjustment and personalization in a single LLM call
 - ReviewAgent: Validates, refines and improves drafts (merged review + refinement)
 - RouterAgent: Handles workflow routing and fallbacks
 """
@@ -19,6 +20,7 @@ from src.agents.intent_detector import IntentDetectorAgent, EmailIntent
 from src.agents.draft_writer import DraftWriterAgent
 from src.agents.tone_stylist import ToneStylistAgent
 from src.agents.personalization import PersonalizationAgent
+from src.agents.fused_style import FusedStyleAgent
 from src.agents.review import ReviewAgent
 from src.agents.router import RouterAgent
 
@@ -28,6 +30,7 @@ __all__ = [
     "DraftWriterAgent",
     "ToneStylistAgent",
     "PersonalizationAgent",
+    "FusedStyleAgent",
     "ReviewAgent",
     "RouterAgent",
     "EmailIntent",
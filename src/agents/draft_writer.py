@@ -6,23 +6,13 @@ the appropriate template based on the detected intent and generates a
 professional, well-structured email draft that includes all key points.
 """
 
-from typing import Dict, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from src.utils.prompts import (
-    OUTREACH_PROMPT,
-    FOLLOWUP_PROMPT,
-    THANKYOU_PROMPT,
-    MEETING_REQUEST_PROMPT,
-    APOLOGY_PROMPT,
-    INFORMATION_REQUEST_PROMPT,
-    STATUS_UPDATE_PROMPT,
-    INTRODUCTION_PROMPT,
-    NETWORKING_PROMPT,
-    COMPLAINT_PROMPT,
-)
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
+from src.utils.prompts import draft_prompt_for, render_fallback
 from src.utils.llm_wrapper import LLMWrapper, make_wrapper
 
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
 
 class DraftWriterAgent:
     """
@@ -46,7 +36,7 @@ class DraftWriterAgent:
         >>> draft = writer.write("outreach", parsed_data, "formal")
     """
     
-    def __init__(self, llm: ChatGoogleGenerativeAI, llm_wrapper: Optional[LLMWrapper] = None):
+    def __init__(self, llm: "ChatGoogleGenerativeAI", llm_wrapper: Optional[LLMWrapper] = None):
         """
         Initialize Draft Writer Agent.
         
@@ -55,23 +45,14 @@ class DraftWriterAgent:
         """
         self.llm = llm
         self.llm_wrapper = llm_wrapper or make_wrapper(llm)
-        # Shared templates imported from prompts.py
-        self.intent_templates = {
-            "outreach": OUTREACH_PROMPT,
-            "follow_up": FOLLOWUP_PROMPT,
-            "thank_you": THANKYOU_PROMPT,
-            "meeting_request": MEETING_REQUEST_PROMPT,
-            "apology": APOLOGY_PROMPT,
-            "information_request": INFORMATION_REQUEST_PROMPT,
-            "status_update": STATUS_UPDATE_PROMPT,
-            "introduction": INTRODUCTION_PROMPT,
-            "networking": NETWORKING_PROMPT,
-            "complaint": COMPLAINT_PROMPT,
-        }
     
-    # Removed per-agent template builders; using shared imported templates instead
-    
-    def write(self, intent: str, parsed_data: Dict, tone: str = "formal") -> str:
+    def write(
+        self,
+        intent: str,
+        parsed_data: Dict,
+        tone: str = "formal",
+        target_length: Optional[int] = None,
+    ) -> str:
         """
         Generate email draft based on intent.
         
@@ -79,6 +60,8 @@ class DraftWriterAgent:
             intent: Email intent classification
             parsed_data: Parsed input data with recipient, purpose, key_points
             tone: Tone preference (formal, casual, assertive, empathetic)
+            target_length: Workflow length preference, used when parsed_data
+                carries no length constraint
             
         Returns:
             str: Generated email draft
@@ -89,37 +72,8 @@ class DraftWriterAgent:
             return self._fallback_draft(parsed_data)
 
         try:
-            # Resolve target length from parsed constraints or workflow state later
-            # Prefer explicit constraint length if provided in parsed_data.constraints
-            constraints = parsed_data.get("constraints", {}) if isinstance(parsed_data, dict) else {}
-            requested_length = None
-            if isinstance(constraints, dict):
-                for k in ("length", "word_count", "max_words", "target_words"):
-                    if k in constraints and isinstance(constraints[k], (int, float)):
-                        requested_length = int(constraints[k])
-                        break
-
-            # Fallback to workflow-provided length_preference by reading an injected attribute (set in state before call)
-            # We'll access via getattr on self for simplicity; __call__ sets self._workflow_length when invoked.
-            if requested_length is None:
-                requested_length = getattr(self, "_workflow_length", None)
-
-            # Apply floor logic: if requested length < 50, use 50; if None, default 170
-            if requested_length is None:
-                effective_length = 170
-            else:
-                effective_length = 50 if requested_length < 50 else requested_length
-
-            template = self.intent_templates.get(intent, self.intent_templates["outreach"])
-            prompt = ChatPromptTemplate.from_template(template)
-            chain = prompt | self.llm
-            response = self.llm_wrapper.invoke_chain(chain, {
-                "recipient": parsed_data.get("recipient_name", ""),
-                "purpose": parsed_data.get("email_purpose", ""),
-                "key_points": "\n- ".join(parsed_data.get("key_points", [])),
-                "tone": tone,
-                "target_length": effective_length,
-            })
+            chain, params = self._chain_and_params(intent, parsed_data, tone, target_length)
+            response = self.llm_wrapper.invoke_chain(chain, params)
             draft = response.content.strip()
             return draft
 
@@ -127,6 +81,76 @@ class DraftWriterAgent:
             print(f"Error writing draft: {e}")
             return self._fallback_draft(parsed_data)
     
+    def stream(
+        self,
+        intent: str,
+        parsed_data: Dict,
+        tone: str = "formal",
+        target_length: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Generate an email draft, yielding text chunks as the model produces them.
+
+        Same inputs and fallbacks as ``write``; joining the chunks gives the
+        draft (before ``write``'s whitespace strip). If the model fails before
+        emitting anything, the fallback draft is yielded as a single chunk.
+
+        Yields:
+            str: Successive pieces of the email draft
+        """
+        from src.utils.config import settings
+        if getattr(settings, "donotusegemini", False) or not hasattr(self.llm, "stream"):
+            yield self._fallback_draft(parsed_data)
+            return
+
+        emitted = False
+        try:
+            chain, params = self._chain_and_params(intent, parsed_data, tone, target_length)
+            for chunk in self.llm_wrapper.stream_chain(chain, params):
+                emitted = True
+                yield chunk
+        except Exception as e:
+            print(f"Error streaming draft: {e}")
+            if not emitted:
+                yield self._fallback_draft(parsed_data)
+
+    def _chain_and_params(
+        self,
+        intent: str,
+        parsed_data: Dict,
+        tone: str,
+        target_length: Optional[int],
+    ) -> Tuple[Any, Dict]:
+        """Build the intent's prompt chain and its input variables."""
+        # Prefer explicit constraint length if provided in parsed_data.constraints
+        constraints = parsed_data.get("constraints", {}) if isinstance(parsed_data, dict) else {}
+        requested_length = None
+        if isinstance(constraints, dict):
+            for k in ("length", "word_count", "max_words", "target_words"):
+                if k in constraints and isinstance(constraints[k], (int, float)):
+                    requested_length = int(constraints[k])
+                    break
+
+        # Fall back to the workflow-provided length_preference
+        if requested_length is None:
+            requested_length = target_length
+
+        # Apply floor logic: if requested length < 50, use 50; if None, default 170
+        if requested_length is None:
+            effective_length = 170
+        else:
+            effective_length = 50 if requested_length < 50 else requested_length
+
+        # Compiled once per intent and reused across calls
+        chain = draft_prompt_for(intent) | self.llm
+        return chain, {
+            "recipient": parsed_data.get("recipient_name", ""),
+            "purpose": parsed_data.get("email_purpose", ""),
+            "key_points": "\n- ".join(parsed_data.get("key_points", [])),
+            "tone": tone,
+            "target_length": effective_length,
+        }
+
     def _fallback_draft(self, parsed_data: Dict) -> str:
         """
         Generate fallback draft when LLM fails.
@@ -137,23 +161,11 @@ class DraftWriterAgent:
         Returns:
             str: Basic email structure
         """
-        recipient = parsed_data.get('recipient_name', 'there')
-        purpose = parsed_data.get('email_purpose', '')
-        key_points = parsed_data.get('key_points', [])
-        
-        draft = f"Dear {recipient},\n\n"
-        draft += f"I hope this email finds you well.\n\n"
-        draft += f"{purpose}\n\n"
-        
-        if key_points:
-            for point in key_points:
-                draft += f"• {point}\n"
-            draft += "\n"
-        
-        draft += "I look forward to hearing from you.\n\n"
-        draft += "Best regards"
-        
-        return draft
+        return render_fallback(
+            parsed_data.get('recipient_name', 'there'),
+            parsed_data.get('email_purpose', ''),
+            parsed_data.get('key_points', []),
+        )
     
     def __call__(self, state: Dict) -> Dict:
         """
@@ -165,11 +177,10 @@ class DraftWriterAgent:
         Returns:
             Dict: Updated state with generated draft
         """
-        # Make workflow length available to write()
-        self._workflow_length = state.get("length_preference")  # type: ignore[attr-defined]
         draft = self.write(
             intent=state["intent"],
             parsed_data=state["parsed_data"],
-            tone=state.get("tone", "formal")
+            tone=state.get("tone", "formal"),
+            target_length=state.get("length_preference"),
         )
         return {"draft": draft}
@@ -0,0 +1,119 @@
+"""
+Fused Style Agent - Tone adjustment and personalization in one LLM call.
+
+ToneStylistAgent and PersonalizationAgent each rewrite the whole draft, so the
+draft is sent to the model twice and generated twice. This agent applies the
+tone guidelines and the sender profile in a single rewrite. It holds a
+PersonalizationAgent for profile loading, signature handling and the
+greeting safety check.
+"""
+
+from typing import TYPE_CHECKING, Dict, Optional
+from src.utils.prompts import fused_style_prompt_for
+from src.utils.llm_wrapper import LLMWrapper, make_wrapper
+from src.agents.personalization import PersonalizationAgent
+
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+
+class FusedStyleAgent:
+    """
+    Adjusts tone and personalizes a draft in one pass.
+
+    Drop-in replacement for the tone_stylist + personalization node pair:
+    returns both ``styled_draft`` and ``personalized_draft`` (the same text).
+
+    Example:
+        >>> llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash")
+        >>> stylist = FusedStyleAgent(llm)
+        >>> final = stylist.style(draft, "formal", user_id="user123")
+    """
+
+    def __init__(self, llm: "ChatGoogleGenerativeAI",
+                 profile_path: str = "src/memory/user_profiles.json",
+                 llm_wrapper: Optional[LLMWrapper] = None,
+                 personalizer: Optional[PersonalizationAgent] = None):
+        """
+        Initialize Fused Style Agent.
+
+        Args:
+            llm: ChatGoogleGenerativeAI instance for processing
+            profile_path: Path to user profiles JSON file
+            personalizer: Existing PersonalizationAgent to share profiles with
+        """
+        self.llm = llm
+        self.llm_wrapper = llm_wrapper or make_wrapper(llm)
+        self.personalizer = personalizer or PersonalizationAgent(
+            llm, profile_path=profile_path, llm_wrapper=self.llm_wrapper
+        )
+
+    def style(
+        self,
+        draft: str,
+        tone: str,
+        user_id: str = "default",
+        profile: Optional[Dict] = None,
+        target_length: Optional[int] = None,
+    ) -> str:
+        """
+        Rewrite the draft in the target tone and add the user's personalization.
+
+        Args:
+            draft: Email draft to rewrite
+            tone: Target tone (formal, casual, assertive, empathetic)
+            user_id: User ID for profile lookup
+            profile: Already-loaded profile (skips the lookup when provided)
+            target_length: Workflow length preference in words
+
+        Returns:
+            str: Styled and personalized email draft
+        """
+        try:
+            profile = profile or self.personalizer.get_profile(user_id)
+            user_name = (profile.get("user_name") or "").strip()
+            # Determine effective target length (fallback 170), floor to 25 if <10
+            target = target_length
+            if target is None:
+                target = 170
+            elif isinstance(target, int) and target < 10:
+                target = 25
+
+            chain = fused_style_prompt_for(tone) | self.llm
+            response = self.llm_wrapper.invoke_chain(chain, {
+                "draft": draft,
+                "tone": tone,
+                "user_name": profile.get("user_name", ""),
+                "user_title": profile.get("user_title", ""),
+                "user_company": profile.get("user_company", ""),
+                "signature": self.personalizer._signature(profile),
+                "style_notes": profile.get("style_notes", "professional"),
+                "reference_context": self.personalizer._reference_context(user_id, draft),
+                "target_length": target,
+            })
+            return self.personalizer._keep_recipient_greeting(draft, response.content.strip(), user_name)
+
+        except Exception as e:
+            print(f"Error styling draft: {e}")
+            profile = profile or self.personalizer.get_profile(user_id)
+            signature = profile.get("signature", "\n\nBest regards")
+            return f"{draft}{signature}"
+
+    def __call__(self, state: Dict) -> Dict:
+        """
+        LangGraph node function - processes state and returns updates.
+
+        Args:
+            state: Current workflow state with draft, tone and optional user_id
+
+        Returns:
+            Dict: Updated state with styled and personalized draft
+        """
+        result = self.style(
+            state["draft"],
+            state.get("tone", "formal"),
+            state.get("user_id", "default"),
+            profile=state.get("user_profile"),
+            target_length=state.get("length_preference"),
+        )
+        return {"styled_draft": result, "personalized_draft": result}
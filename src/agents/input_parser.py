@@ -6,14 +6,17 @@ unstructured user requests and extracts key information needed for email
 generation: recipient, purpose, key points, tone preference, and constraints.
 """
 
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
 import re
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
-from src.utils.prompts import INPUT_PARSER_PROMPT
+from src.utils import prompts
 from pydantic import BaseModel, Field, field_validator, ValidationError
 import json
 from src.utils.llm_wrapper import LLMWrapper, make_wrapper
+from src.utils.semantic_cache import get_semantic_cache
+
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
 
 
 class ParsedInput(BaseModel):
@@ -61,7 +64,7 @@ class InputParserAgent:
         >>> print(result.email_purpose)
     """
     
-    def __init__(self, llm: ChatGoogleGenerativeAI, llm_wrapper: Optional[LLMWrapper] = None):
+    def __init__(self, llm: "ChatGoogleGenerativeAI", llm_wrapper: Optional[LLMWrapper] = None):
         """
         Initialize Input Parser Agent.
         
@@ -71,7 +74,7 @@ class InputParserAgent:
         self.llm = llm
         self.llm_wrapper = llm_wrapper or make_wrapper(llm)
         # Use shared prompt template from prompts.py
-        self.prompt = INPUT_PARSER_PROMPT
+        self.prompt = prompts.INPUT_PARSER_PROMPT
     
     def parse(self, user_input: str) -> ParsedInput:
         """
@@ -91,6 +94,17 @@ class InputParserAgent:
         if getattr(settings, "donotusegemini", False) or not hasattr(self.llm, "invoke"):
             return self._fallback_parse(user_input)
 
+        # Parses carry request-specific names and points, so only reuse a
+        # result for the same (normalized) request text
+        cache = (
+            get_semantic_cache("input_parser", threshold=1.0)
+            if getattr(settings, "enable_semantic_cache", False) else None
+        )
+        if cache is not None:
+            cached = cache.get(user_input)
+            if cached is not None:
+                return ParsedInput(**cached)
+
         try:
             chain = self.prompt | self.llm
             response = self.llm_wrapper.invoke_chain(chain, {"user_input": user_input})
@@ -139,7 +153,10 @@ class InputParserAgent:
             parsed_data.setdefault("constraints", {})
             parsed_data.setdefault("context", user_input)
 
-            return ParsedInput(**parsed_data)
+            parsed = ParsedInput(**parsed_data)
+            if cache is not None:
+                cache.put(user_input, parsed.model_dump())
+            return parsed
 
         except (json.JSONDecodeError, ValidationError) as e:
             # Log as info (not fatal) and return fallback structure
@@ -6,12 +6,15 @@ follow-up, thank you, etc.) based on the email purpose and context. Intent
 classification helps select the appropriate template and writing style.
 """
 
-from typing import Dict, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import TYPE_CHECKING, Dict, Optional
 from langchain_core.prompts import ChatPromptTemplate
-from src.utils.prompts import INTENT_DETECTOR_PROMPT
+from src.utils import prompts
 from enum import Enum
 from src.utils.llm_wrapper import LLMWrapper, make_wrapper
+from src.utils.semantic_cache import get_semantic_cache
+
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
 
 
 class EmailIntent(str, Enum):
@@ -47,7 +50,7 @@ class IntentDetectorAgent:
         >>> print(intent)  # "outreach", "follow_up", etc.
     """
     
-    def __init__(self, llm: ChatGoogleGenerativeAI, llm_wrapper: Optional[LLMWrapper] = None):
+    def __init__(self, llm: "ChatGoogleGenerativeAI", llm_wrapper: Optional[LLMWrapper] = None):
         """
         Initialize Intent Detector Agent.
         
@@ -58,7 +61,7 @@ class IntentDetectorAgent:
         self.llm_wrapper = llm_wrapper or make_wrapper(llm)
         self.intents = [intent.value for intent in EmailIntent]
         # Use shared intent detector prompt
-        self.prompt = INTENT_DETECTOR_PROMPT
+        self.prompt = prompts.INTENT_DETECTOR_PROMPT
     
     def detect(self, parsed_data: Dict) -> str:
         """
@@ -89,25 +92,40 @@ class IntentDetectorAgent:
                 return "status_update"
             return "outreach"
 
+        params = {
+            "intents": ", ".join(self.intents),
+            "email_purpose": parsed_data.get("email_purpose", ""),
+            "key_points": ", ".join(parsed_data.get("key_points", [])),
+            "context": parsed_data.get("context", "")
+        }
+
+        # Near-duplicate requests map to the same intent; reuse earlier answers
+        cache = get_semantic_cache("intent_detector") if getattr(settings, "enable_semantic_cache", False) else None
+        cache_key = f"{params['email_purpose']} | {params['key_points']} | {params['context']}"
+        cache_vec = None
+        if cache is not None:
+            cached, cache_vec = cache.get(cache_key, return_vec=True)
+            if cached is not None:
+                return cached
+
         try:
             chain = self.prompt | self.llm
-            response = self.llm_wrapper.invoke_chain(chain, {
-                "intents": ", ".join(self.intents),
-                "email_purpose": parsed_data.get("email_purpose", ""),
-                "key_points": ", ".join(parsed_data.get("key_points", [])),
-                "context": parsed_data.get("context", "")
-            })
+            response = self.llm_wrapper.invoke_chain(chain, params)
 
             intent = response.content.strip().lower().replace(" ", "_")
 
             # Validate intent
-            if intent in self.intents:
-                return intent
+            if intent not in self.intents:
+                # Try to find closest match
+                intent = next(
+                    (v for v in self.intents if v in intent or intent in v),
+                    None,
+                )
 
-            # Try to find closest match
-            for valid_intent in self.intents:
-                if valid_intent in intent or intent in valid_intent:
-                    return valid_intent
+            if intent is not None:
+                if cache is not None:
+                    cache.put(cache_key, intent, vec=cache_vec)
+                return intent
 
             # Fallback to outreach if no match found
             return "outreach"
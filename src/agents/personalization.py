@@ -6,16 +6,22 @@ company details, personal preferences, and personalization markers. It makes
 emails feel more authentic and tailored to the user.
 """
 
-from typing import Dict, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import TYPE_CHECKING, Dict, Optional
 from langchain_core.prompts import ChatPromptTemplate
-from src.utils.prompts import PERSONALIZATION_PROMPT
+from src.utils import prompts
 import json
 import os
 from src.utils.llm_wrapper import LLMWrapper, make_wrapper
+from src.utils.prompt_compression import compress_context
 import re
 from textwrap import shorten
 
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+_GREETING_RE = re.compile(r"^(dear|hi|hello)\b", re.IGNORECASE)
+_GREETING_NAME_RE = re.compile(r"^(?:\s*)(dear|hi|hello)\s+([^,\n]+)", re.IGNORECASE)
+
 
 class PersonalizationAgent:
     """
@@ -36,7 +42,7 @@ class PersonalizationAgent:
         >>> personal_draft = personalizer.personalize(draft, user_id="user123")
     """
     
-    def __init__(self, llm: ChatGoogleGenerativeAI, 
+    def __init__(self, llm: "ChatGoogleGenerativeAI", 
                  profile_path: str = "src/memory/user_profiles.json",
                  llm_wrapper: Optional[LLMWrapper] = None):
         """
@@ -49,10 +55,11 @@ class PersonalizationAgent:
         self.llm = llm
         self.llm_wrapper = llm_wrapper or make_wrapper(llm)
         self.profile_path = profile_path
+        self._profiles_stamp = None
         self.profiles = self._load_profiles()
         
         # Use shared personalization prompt
-        self.prompt = PERSONALIZATION_PROMPT
+        self.prompt = prompts.PERSONALIZATION_PROMPT
     
     def _load_profiles(self) -> Dict:
         """
@@ -61,6 +68,7 @@ class PersonalizationAgent:
         Returns:
             Dict: User profiles indexed by user_id
         """
+        self._profiles_stamp = self._profile_file_stamp()
         if os.path.exists(self.profile_path):
             try:
                 with open(self.profile_path, 'r') as f:
@@ -69,6 +77,23 @@ class PersonalizationAgent:
                 return {"default": self._get_default_profile()}
         return {"default": self._get_default_profile()}
     
+    def _profile_file_stamp(self) -> Optional[tuple]:
+        """Return (mtime_ns, size) of the profiles file, or None if missing."""
+        try:
+            st = os.stat(self.profile_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _refresh_profiles(self) -> None:
+        """Reload profiles if the file changed since it was last read.
+
+        The workflow keeps one agent per process, while profile edits (e.g.
+        from the API) go through other instances writing the same file.
+        """
+        if self._profile_file_stamp() != self._profiles_stamp:
+            self.profiles = self._load_profiles()
+
     def _get_default_profile(self) -> Dict:
         """
         Get default profile template.
@@ -117,6 +142,7 @@ class PersonalizationAgent:
             print(f"[PersonalizationAgent] Failed to load profile from DB for user {user_id}: {e}")
 
         # Fallback to local JSON profiles
+        self._refresh_profiles()
         json_profile = self.profiles.get(user_id, self._get_default_profile())
         print(f"[PersonalizationAgent] Using JSON profile for user {user_id}: name={json_profile.get('user_name', 'User')}")
         return json_profile
@@ -129,67 +155,42 @@ class PersonalizationAgent:
             user_id: User identifier
             profile_data: Profile data to save
         """
+        # Merge into the latest file contents, not a stale snapshot
+        self._refresh_profiles()
         self.profiles[user_id] = profile_data
         
         os.makedirs(os.path.dirname(self.profile_path), exist_ok=True)
         with open(self.profile_path, 'w') as f:
             json.dump(self.profiles, f, indent=2)
+        self._profiles_stamp = self._profile_file_stamp()
     
-    def personalize(self, draft: str, user_id: str = "default") -> str:
+    def personalize(
+        self,
+        draft: str,
+        user_id: str = "default",
+        profile: Optional[Dict] = None,
+        target_length: Optional[int] = None,
+    ) -> str:
         """
         Add personalization to draft.
         
         Args:
             draft: Email draft to personalize
             user_id: User ID for profile lookup
+            profile: Already-loaded profile (skips the lookup when provided)
+            target_length: Workflow length preference in words
             
         Returns:
             str: Personalized email draft
         """
         try:
-            profile = self.get_profile(user_id)
-            # Build optional reference context from similar past drafts via Chroma
-            reference_context = ""
-            try:
-                from src.utils.vector_store import get_vector_store
-                store = get_vector_store()
-                if store is not None:
-                    sims = store.query_similar(user_id=user_id, query_text=draft, k=3)
-                    if sims:
-                        lines = []
-                        for i, item in enumerate(sims, start=1):
-                            txt = item.get("content") or ""
-                            meta = item.get("metadata") or {}
-                            created = meta.get("created_at") or meta.get("timestamp") or meta.get("date")
-                            prefix = f"Example {i}" + (f" (from {created})" if created else "")
-                            # Limit each sample to ~400 chars to keep prompt lean
-                            snippet = shorten(" ".join(txt.split()), width=400, placeholder="…")
-                            lines.append(f"- {prefix}:\n  {snippet}")
-                        reference_context = "\n".join(lines)
-            except Exception:
-                # Safe to ignore retrieval errors; fall back to no context
-                reference_context = ""
-            # Ensure the signature includes the user's name if available
+            profile = profile or self.get_profile(user_id)
+            reference_context = self._reference_context(user_id, draft)
             user_name = (profile.get("user_name") or "").strip()
-            signature = profile.get("signature", "\n\nBest regards")
-            try:
-                sig_base = signature.strip()
-                # Prepend spacing if missing
-                if not sig_base.startswith("\n"):
-                    sig_base = "\n\n" + sig_base
-                # If name isn't already present, append it on a new line
-                if user_name and user_name.lower() not in sig_base.lower():
-                    if not sig_base.endswith(",") and not sig_base.endswith(",\n"):
-                        sig_base = sig_base + ","
-                    sig_final = f"{sig_base}\n{user_name}"
-                else:
-                    sig_final = sig_base
-            except Exception:
-                sig_final = profile.get("signature", "\n\nBest regards")
 
             chain = self.prompt | self.llm
             # Determine effective target length (fallback 170), floor to 25 if <10
-            target = getattr(self, "_workflow_length", None)
+            target = target_length
             if target is None:
                 target = 170
             elif isinstance(target, int) and target < 10:
@@ -200,38 +201,77 @@ class PersonalizationAgent:
                 "user_name": profile.get("user_name", ""),
                 "user_title": profile.get("user_title", ""),
                 "user_company": profile.get("user_company", ""),
-                "signature": sig_final,
+                "signature": self._signature(profile),
                 "style_notes": profile.get("style_notes", "professional"),
                 "target_length": target,
                 "reference_context": reference_context,
             })
             
-            personalized = response.content.strip()
-
-            # Safety check: preserve original greeting/recipient if model drifted
-            try:
-                # Extract original greeting line
-                orig_greet = self._extract_greeting_line(draft)
-                new_greet = self._extract_greeting_line(personalized)
-                if orig_greet and new_greet:
-                    # Extract names for comparison
-                    orig_name = self._extract_name_from_greeting(orig_greet)
-                    new_name = self._extract_name_from_greeting(new_greet)
-                    user_name_ci = (user_name or "").strip().lower()
-                    if user_name_ci and new_name and new_name.lower() == user_name_ci and orig_name and orig_name.lower() != user_name_ci:
-                        # Replace the greeting line in the personalized text with the original greeting
-                        personalized = personalized.replace(new_greet, orig_greet, 1)
-            except Exception:
-                pass
-
-            return personalized
+            return self._keep_recipient_greeting(draft, response.content.strip(), user_name)
             
         except Exception as e:
             print(f"Error personalizing draft: {e}")
             # Add basic signature if personalization fails
-            profile = self.get_profile(user_id)
+            profile = profile or self.get_profile(user_id)
             signature = profile.get("signature", "\n\nBest regards")
             return f"{draft}{signature}"
+
+    def _reference_context(self, user_id: str, draft: str) -> str:
+        """Summarize similar past drafts from Chroma as style references ("" if none)."""
+        try:
+            from src.utils.vector_store import get_vector_store
+            store = get_vector_store()
+            if store is None:
+                return ""
+            sims = store.query_similar(user_id=user_id, query_text=draft, k=3)
+            lines = []
+            for i, item in enumerate(sims or [], start=1):
+                txt = item.get("content") or ""
+                meta = item.get("metadata") or {}
+                created = meta.get("created_at") or meta.get("timestamp") or meta.get("date")
+                prefix = f"Example {i}" + (f" (from {created})" if created else "")
+                # Limit each sample to ~400 chars to keep prompt lean
+                snippet = shorten(" ".join(txt.split()), width=400, placeholder="…")
+                lines.append(f"- {prefix}:\n  {snippet}")
+            return compress_context("\n".join(lines))
+        except Exception:
+            # Safe to ignore retrieval errors; fall back to no context
+            return ""
+
+    def _signature(self, profile: Dict) -> str:
+        """Profile signature, with the user's name appended when it is missing."""
+        user_name = (profile.get("user_name") or "").strip()
+        signature = profile.get("signature", "\n\nBest regards")
+        try:
+            sig_base = signature.strip()
+            # Prepend spacing if missing
+            if not sig_base.startswith("\n"):
+                sig_base = "\n\n" + sig_base
+            # If name isn't already present, append it on a new line
+            if user_name and user_name.lower() not in sig_base.lower():
+                if not sig_base.endswith(",") and not sig_base.endswith(",\n"):
+                    sig_base = sig_base + ","
+                return f"{sig_base}\n{user_name}"
+            return sig_base
+        except Exception:
+            return signature
+
+    def _keep_recipient_greeting(self, draft: str, personalized: str, user_name: str) -> str:
+        """Restore the original greeting if the model addressed the sender instead."""
+        try:
+            orig_greet = self._extract_greeting_line(draft)
+            new_greet = self._extract_greeting_line(personalized)
+            if orig_greet and new_greet:
+                # Extract names for comparison
+                orig_name = self._extract_name_from_greeting(orig_greet)
+                new_name = self._extract_name_from_greeting(new_greet)
+                user_name_ci = (user_name or "").strip().lower()
+                if user_name_ci and new_name and new_name.lower() == user_name_ci and orig_name and orig_name.lower() != user_name_ci:
+                    # Replace the greeting line in the personalized text with the original greeting
+                    personalized = personalized.replace(new_greet, orig_greet, 1)
+        except Exception:
+            pass
+        return personalized
     
     def __call__(self, state: Dict) -> Dict:
         """
@@ -246,26 +286,35 @@ class PersonalizationAgent:
         # Use styled_draft if available, otherwise use draft
         draft_to_personalize = state.get("styled_draft", state.get("draft", ""))
         
-        # Surface workflow length to personalize()
-        self._workflow_length = state.get("length_preference")  # type: ignore[attr-defined]
         personalized = self.personalize(
             draft_to_personalize,
-            state.get("user_id", "default")
+            state.get("user_id", "default"),
+            profile=state.get("user_profile"),
+            target_length=state.get("length_preference"),
         )
         return {"personalized_draft": personalized}
 
+    def prefetch_profile(self, state: Dict) -> Dict:
+        """
+        Workflow node that loads the user profile ahead of personalization.
+        
+        The lookup only needs user_id, so the workflow can run it alongside
+        the drafting stages instead of on the critical path.
+        """
+        return {"user_profile": self.get_profile(state.get("user_id", "default"))}
+
     def _extract_greeting_line(self, text: str) -> Optional[str]:
         """Return the first greeting line like 'Dear X,' or 'Hi X,' if present."""
         for line in text.splitlines():
             s = line.strip()
-            if re.match(r"^(dear|hi|hello)\b", s, flags=re.IGNORECASE):
+            if _GREETING_RE.match(s):
                 # Normalize to include trailing comma if present in the line
                 return line
         return None
 
     def _extract_name_from_greeting(self, greeting_line: str) -> Optional[str]:
         """Extract the name part from a greeting line (e.g., 'Dear Jane,' -> 'Jane')."""
-        m = re.search(r"^(?:\s*)(dear|hi|hello)\s+([^,\n]+)", greeting_line, flags=re.IGNORECASE)
+        m = _GREETING_NAME_RE.search(greeting_line)
         if m:
             return m.group(2).strip()
         return None
@@ -6,13 +6,15 @@ grammar, clarity, tone alignment, and completeness. It can suggest improvements
 or return the draft as-is if it meets quality standards.
 """
 
-from typing import Dict, List, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import TYPE_CHECKING, Dict, List, Optional
 from langchain_core.prompts import ChatPromptTemplate
-from src.utils.prompts import REVIEW_AGENT_PROMPT
+from src.utils import prompts
 import re
 from src.utils.llm_wrapper import LLMWrapper, make_wrapper
 
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
 
 class ReviewAgent:
     """
@@ -35,7 +37,7 @@ class ReviewAgent:
         >>> print(result["final_draft"])
     """
     
-    def __init__(self, llm: ChatGoogleGenerativeAI, llm_wrapper: Optional[LLMWrapper] = None):
+    def __init__(self, llm: "ChatGoogleGenerativeAI", llm_wrapper: Optional[LLMWrapper] = None):
         """
         Initialize Review Agent.
         
@@ -45,9 +47,9 @@ class ReviewAgent:
         self.llm = llm
         self.llm_wrapper = llm_wrapper or make_wrapper(llm)
         # Use shared review prompt
-        self.review_prompt = REVIEW_AGENT_PROMPT
+        self.review_prompt = prompts.REVIEW_AGENT_PROMPT
     
-    def review(self, draft: str, tone: str, intent: str) -> Dict:
+    def review(self, draft: str, tone: str, intent: str, target_length: Optional[int] = None) -> Dict:
         """
         Review and improve email draft using LLM (always).
 
@@ -55,6 +57,7 @@ class ReviewAgent:
             draft: Email draft to review
             tone: Expected tone of the email
             intent: Email intent classification
+            target_length: Workflow length preference in words
 
         Returns:
             Dict: Review result with approved status, final draft, and any issues found
@@ -64,39 +67,78 @@ class ReviewAgent:
             heuristic_issues = self._quick_validation(draft)
 
             chain = self.review_prompt | self.llm
-            # Determine effective target length (fallback 170), floor to 25 if <10
-            target = getattr(self, "_workflow_length", None)
-            if target is None:
-                target = 170
-            elif isinstance(target, int) and target < 10:
-                target = 25
-
-            response = self.llm_wrapper.invoke_chain(chain, {
-                "draft": draft,
-                "tone": tone,
-                "intent": intent,
-                "target_length": target,
-            })
+            response = self.llm_wrapper.invoke_chain(
+                chain, self._review_params(draft, tone, intent, target_length)
+            )
+            return self._review_result(draft, response, heuristic_issues)
 
-            improved_text = getattr(response, "content", str(response)).strip()
-            improved = improved_text.strip() != draft.strip()
+        except Exception as e:
+            print(f"Error reviewing draft: {e}")
+            return self._unavailable_result(draft)
 
-            return {
-                "approved": True,
-                "final_draft": improved_text or draft,
-                "issues": heuristic_issues,
-                "improved": bool(improved)
-            }
+    def review_many(
+        self,
+        drafts: List[str],
+        tone: str,
+        intent: str,
+        target_length: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Review several drafts with one batched LLM request.
 
+        Results line up with ``drafts`` and have the same shape as ``review``.
+        If the batch fails, every draft gets the review-unavailable result.
+        """
+        if not drafts:
+            return []
+        try:
+            chain = self.review_prompt | self.llm
+            responses = self.llm_wrapper.invoke_batch(
+                chain, [self._review_params(d, tone, intent, target_length) for d in drafts]
+            )
+            return [
+                self._review_result(draft, response, self._quick_validation(draft))
+                for draft, response in zip(drafts, responses)
+            ]
         except Exception as e:
-            print(f"Error reviewing draft: {e}")
-            # Return original draft if review fails
-            return {
-                "approved": True,
-                "final_draft": draft,
-                "issues": ["Review service temporarily unavailable"],
-                "improved": False
-            }
+            print(f"Error reviewing drafts: {e}")
+            return [self._unavailable_result(draft) for draft in drafts]
+
+    def _review_params(self, draft: str, tone: str, intent: str, target_length: Optional[int]) -> Dict:
+        """Prompt variables for one review call."""
+        # Determine effective target length (fallback 170), floor to 25 if <10
+        target = target_length
+        if target is None:
+            target = 170
+        elif isinstance(target, int) and target < 10:
+            target = 25
+        return {
+            "draft": draft,
+            "tone": tone,
+            "intent": intent,
+            "target_length": target,
+        }
+
+    def _review_result(self, draft: str, response, heuristic_issues: List[str]) -> Dict:
+        """Build the review result for one LLM response."""
+        improved_text = getattr(response, "content", str(response)).strip()
+        improved = improved_text.strip() != draft.strip()
+
+        return {
+            "approved": True,
+            "final_draft": improved_text or draft,
+            "issues": heuristic_issues,
+            "improved": bool(improved)
+        }
+
+    def _unavailable_result(self, draft: str) -> Dict:
+        """Return the original draft when the review call fails."""
+        return {
+            "approved": True,
+            "final_draft": draft,
+            "issues": ["Review service temporarily unavailable"],
+            "improved": False
+        }
     
     def _quick_validation(self, draft: str) -> List[str]:
         """
@@ -158,12 +200,11 @@ class ReviewAgent:
         # Use personalized_draft if available, otherwise use draft
         draft_to_review = state.get("personalized_draft", state.get("draft", ""))
         
-        # Surface workflow length to review()
-        self._workflow_length = state.get("length_preference")  # type: ignore[attr-defined]
         result = self.review(
             draft_to_review,
             state.get("tone", "formal"),
-            state.get("intent", "outreach")
+            state.get("intent", "outreach"),
+            target_length=state.get("length_preference"),
         )
         
         return {
@@ -6,11 +6,14 @@ steps, handling errors, managing retries, and providing fallback mechanisms
 when primary processing fails.
 """
 
-from typing import Dict, Literal, List
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import TYPE_CHECKING, Dict, Literal, List
 import json
 from src.utils.config import settings
-from src.utils.prompts import ROUTER_AGENT_PROMPT
+from src.utils import prompts
+from src.utils.prompts import render_fallback
+
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
 
 
 class RouterAgent:
@@ -32,7 +35,7 @@ class RouterAgent:
         >>> next_step = router.route_next_step(state)
     """
     
-    def __init__(self, llm: ChatGoogleGenerativeAI = None, max_retries: int = 3):
+    def __init__(self, llm: "ChatGoogleGenerativeAI" = None, max_retries: int = 3):
         """
         Initialize Router Agent.
         
@@ -93,7 +96,7 @@ class RouterAgent:
         )
 
         try:
-            prompt = ROUTER_AGENT_PROMPT.format_messages(state_summary=summary)
+            prompt = prompts.render_prompt("ROUTER_AGENT_PROMPT", state_summary=summary)
             response = self.llm.invoke(prompt)
             raw = response.content.strip()
             # Attempt JSON parse; clean common formatting artifacts
@@ -138,28 +141,11 @@ class RouterAgent:
             str: Basic but valid email draft
         """
         parsed = state.get("parsed_data", {})
-        recipient = parsed.get("recipient_name", "there")
-        purpose = parsed.get("email_purpose", "reach out")
-        key_points = parsed.get("key_points", [])
-        
-        fallback = f"""Dear {recipient},
-
-I hope this email finds you well.
-
-I wanted to {purpose}.
-
-"""
-        
-        if key_points:
-            for point in key_points:
-                fallback += f"• {point}\n"
-            fallback += "\n"
-        
-        fallback += """I look forward to hearing from you.
-
-Best regards"""
-        
-        return fallback
+        return render_fallback(
+            parsed.get("recipient_name", "there"),
+            f"I wanted to {parsed.get('email_purpose', 'reach out')}.",
+            parsed.get("key_points", []),
+        )
     
     def validate_state(self, state: Dict) -> tuple[bool, List[str]]:
         """
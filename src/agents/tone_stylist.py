@@ -6,12 +6,13 @@ desired tone (formal, casual, assertive, empathetic). It maintains the
 core message while changing vocabulary, structure, and style.
 """
 
-from typing import Dict, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from src.utils.prompts import TONE_STYLIST_PROMPT
+from typing import TYPE_CHECKING, ClassVar, Dict, Mapping, Optional
+from src.utils.prompts import TONE_GUIDELINES, tone_stylist_prompt_for
 from src.utils.llm_wrapper import LLMWrapper, make_wrapper
 
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
 
 class ToneStylistAgent:
     """
@@ -38,39 +39,10 @@ class ToneStylistAgent:
         >>> styled = stylist.adjust_tone(draft, "casual")
     """
     
-    # Tone configuration guidelines
-    TONE_GUIDELINES = {
-        "formal": {
-            "characteristics": "Professional, structured, no contractions, proper titles",
-            "vocabulary": "sophisticated, traditional business language",
-            "structure": "well-organized with clear paragraphs",
-            "greeting": "Dear [Name] / Dear Sir/Madam",
-            "closing": "Sincerely / Best regards / Respectfully"
-        },
-        "casual": {
-            "characteristics": "Friendly, conversational, use contractions",
-            "vocabulary": "simple, everyday language",
-            "structure": "natural flow, shorter paragraphs",
-            "greeting": "Hi [Name] / Hey [Name]",
-            "closing": "Thanks / Cheers / Best"
-        },
-        "assertive": {
-            "characteristics": "Direct, confident, action-oriented, clear",
-            "vocabulary": "strong action verbs, decisive language",
-            "structure": "bullet points, clear CTAs",
-            "greeting": "Hello [Name]",
-            "closing": "Looking forward to your response / Let's move forward"
-        },
-        "empathetic": {
-            "characteristics": "Understanding, supportive, compassionate",
-            "vocabulary": "warm, acknowledging feelings",
-            "structure": "gentle flow, validating statements",
-            "greeting": "Dear [Name]",
-            "closing": "With understanding / Warm regards"
-        }
-    }
+    # Tone configuration guidelines (shared with prompts.py)
+    TONE_GUIDELINES: ClassVar[Mapping[str, Mapping[str, str]]] = TONE_GUIDELINES
     
-    def __init__(self, llm: ChatGoogleGenerativeAI, llm_wrapper: Optional[LLMWrapper] = None):
+    def __init__(self, llm: "ChatGoogleGenerativeAI", llm_wrapper: Optional[LLMWrapper] = None):
         """
         Initialize Tone Stylist Agent.
         
@@ -79,27 +51,24 @@ class ToneStylistAgent:
         """
         self.llm = llm
         self.llm_wrapper = llm_wrapper or make_wrapper(llm)
-        # Use shared tone stylist prompt
-        self.prompt = TONE_STYLIST_PROMPT
     
-    def adjust_tone(self, draft: str, tone: str) -> str:
+    def adjust_tone(self, draft: str, tone: str, target_length: Optional[int] = None) -> str:
         """
         Adjust email tone.
         
         Args:
             draft: Original email draft
             tone: Target tone (formal, casual, assertive, empathetic)
+            target_length: Workflow length preference in words
             
         Returns:
             str: Email draft with adjusted tone
         """
         try:
-            # Get tone-specific guidelines
-            guidelines = self.TONE_GUIDELINES.get(tone, self.TONE_GUIDELINES["formal"])
-            
-            chain = self.prompt | self.llm
+            # Tone guidelines are pre-bound on the cached prompt partial
+            chain = tone_stylist_prompt_for(tone) | self.llm
             # Determine effective target length (fallback 170), floor to 25 if <10
-            target = getattr(self, "_workflow_length", None)
+            target = target_length
             if target is None:
                 target = 170
             elif isinstance(target, int) and target < 10:
@@ -109,7 +78,6 @@ class ToneStylistAgent:
                 "draft": draft,
                 "tone": tone,
                 "target_length": target,
-                **guidelines
             })
             
             return response.content.strip()
@@ -129,10 +97,9 @@ class ToneStylistAgent:
         Returns:
             Dict: Updated state with tone-adjusted draft
         """
-        # Surface workflow length to adjust_tone
-        self._workflow_length = state.get("length_preference")  # type: ignore[attr-defined]
         styled_draft = self.adjust_tone(
             state["draft"],
-            state.get("tone", "formal")
+            state.get("tone", "formal"),
+            target_length=state.get("length_preference"),
         )
         return {"styled_draft": styled_draft}
@@ -8,6 +8,11 @@ import secrets
 from typing import Dict, Optional
 from datetime import datetime, timedelta
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
 
 class SessionManager:
     """
@@ -57,8 +62,9 @@ class SessionManager:
         """Load sessions from JSON file."""
         if os.path.exists(self.sessions_file):
             try:
-                with open(self.sessions_file, 'r') as f:
-                    self.sessions = json.load(f)
+                with open(self.sessions_file, 'rb') as f:
+                    data = f.read()
+                self.sessions = orjson.loads(data) if orjson is not None else json.loads(data)
                 # Clean expired sessions on load
                 self._cleanup_expired_sessions()
             except (json.JSONDecodeError, FileNotFoundError):
@@ -66,8 +72,12 @@ class SessionManager:
     
     def _save_sessions(self):
         """Save sessions to JSON file."""
-        with open(self.sessions_file, 'w') as f:
-            json.dump(self.sessions, f, indent=2)
+        if orjson is not None:
+            data = orjson.dumps(self.sessions, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(self.sessions, indent=2).encode()
+        with open(self.sessions_file, 'wb') as f:
+            f.write(data)
     
     def _cleanup_expired_sessions(self):
         """Remove expired sessions."""
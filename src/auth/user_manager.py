@@ -10,6 +10,11 @@ from typing import Dict, Optional, List
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
 
 class UserManager:
     """
@@ -49,15 +54,22 @@ class UserManager:
         """Load users from JSON file."""
         if os.path.exists(self.users_file):
             try:
-                with open(self.users_file, 'r') as f:
-                    self.users = json.load(f)
+                with open(self.users_file, 'rb') as f:
+                    data = f.read()
+                self.users = orjson.loads(data) if orjson is not None else json.loads(data)
             except (json.JSONDecodeError, FileNotFoundError):
                 self.users = {}
     
     def _save_users(self):
         """Save users to JSON file."""
-        with open(self.users_file, 'w') as f:
-            json.dump(self.users, f, indent=2)
+        # Serialize first so the file gets a single write (json.dump issues
+        # one write per token); orjson produces the same indented layout
+        if orjson is not None:
+            data = orjson.dumps(self.users, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(self.users, indent=2).encode()
+        with open(self.users_file, 'wb') as f:
+            f.write(data)
     
     def _hash_password(self, password: str, salt: Optional[str] = None) -> tuple[str, str]:
         """
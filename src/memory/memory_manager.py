@@ -9,7 +9,7 @@ from typing import Any, Dict, Optional, List
 from pathlib import Path
 from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 import logging
 
 logger = logging.getLogger(__name__)
@@ -272,64 +272,78 @@ class MemoryManager:
                     "timestamp": draft.created_at.isoformat() if draft.created_at else None,  # Frontend expects this
                 })
             
-            if not result:
-                # Migration fallback: if DB has no drafts but a JSON fallback file exists (from earlier failures),
-                # ingest those drafts into the database so history becomes visible.
-                user_drafts_file = self.drafts_dir / f"{user_id}_drafts.json"
-                if user_drafts_file.exists():
-                    try:
-                        with open(user_drafts_file, "r") as f:
-                            legacy_drafts = json.load(f)
-                        migrated_count = 0
-                        for legacy in legacy_drafts:
-                            content = legacy.get("content") or legacy.get("draft", "")
-                            if not content:
-                                continue
-                            draft_obj = Draft(
-                                user_id=user_id,
-                                content=content,
-                                original_input=legacy.get("original_input"),
-                                draft_metadata=legacy.get("metadata", {}),
-                            )
-                            db.add(draft_obj)
-                            migrated_count += 1
-                        if migrated_count:
-                            db.commit()
-                            # Re-query now that we've migrated
-                            query = db.query(Draft).filter_by(user_id=user_id).order_by(desc(Draft.created_at))
-                            if limit:
-                                query = query.limit(limit)
-                            drafts = query.all()
-                            result = [
-                                {
-                                    "id": d.id,
-                                    "content": d.content,
-                                    "draft": d.content,  # Backward compatibility alias for frontend
-                                    "original_input": d.original_input,
-                                    "metadata": d.draft_metadata or {},
-                                    "created_at": d.created_at.isoformat() if d.created_at else None,
-                                    "timestamp": d.created_at.isoformat() if d.created_at else None,
-                                }
-                                for d in drafts
-                            ]
-                            logger.info(
-                                f"Migrated {migrated_count} legacy JSON drafts for user {user_id} into database"
-                            )
-                            # Optionally remove legacy file after successful migration
-                            try:
-                                user_drafts_file.unlink()
-                            except OSError:
-                                pass
-                    except Exception as mig_err:
-                        logger.warning(
-                            f"Failed migrating legacy JSON drafts for user {user_id}: {mig_err}"
-                        )
+            if not result and self._migrate_legacy_drafts(db, user_id):
+                # Re-query now that we've migrated
+                query = db.query(Draft).filter_by(user_id=user_id).order_by(desc(Draft.created_at))
+                if limit:
+                    query = query.limit(limit)
+                result = [
+                    {
+                        "id": d.id,
+                        "content": d.content,
+                        "draft": d.content,  # Backward compatibility alias for frontend
+                        "original_input": d.original_input,
+                        "metadata": d.draft_metadata or {},
+                        "created_at": d.created_at.isoformat() if d.created_at else None,
+                        "timestamp": d.created_at.isoformat() if d.created_at else None,
+                    }
+                    for d in query.all()
+                ]
             logger.debug(f"Loaded {len(result)} drafts from database for user {user_id}")
             return result
         finally:
             if self.db_session is None:  # Close only if we created it
                 db.close()
 
+    def _migrate_legacy_drafts(self, db: Session, user_id: str) -> int:
+        """Move a user's legacy JSON fallback drafts into the database.
+
+        Called when the database has no drafts for the user but a JSON file
+        from earlier failures exists, so that history becomes visible.
+
+        Returns:
+            Number of drafts migrated (0 if there was nothing to migrate)
+        """
+        from src.db.models import Draft
+
+        user_drafts_file = self.drafts_dir / f"{user_id}_drafts.json"
+        if not user_drafts_file.exists():
+            return 0
+        try:
+            with open(user_drafts_file, "r") as f:
+                legacy_drafts = json.load(f)
+            migrated_count = 0
+            for legacy in legacy_drafts:
+                content = legacy.get("content") or legacy.get("draft", "")
+                if not content:
+                    continue
+                draft_obj = Draft(
+                    user_id=user_id,
+                    content=content,
+                    original_input=legacy.get("original_input"),
+                    draft_metadata=legacy.get("metadata", {}),
+                )
+                db.add(draft_obj)
+                migrated_count += 1
+            if not migrated_count:
+                return 0
+            db.commit()
+            logger.info(
+                f"Migrated {migrated_count} legacy JSON drafts for user {user_id} into database"
+            )
+            # Optionally remove legacy file after successful migration
+            try:
+                user_drafts_file.unlink()
+            except OSError:
+                pass
+            return migrated_count
+        except Exception as mig_err:
+            db.rollback()
+            logger.warning(
+                f"Failed migrating legacy JSON drafts for user {user_id}: {mig_err}"
+            )
+            return 0
+
     def _load_drafts_json(self, user_id: str, limit: int = None) -> List[Dict[str, Any]]:
         """Load drafts from JSON file (fallback)."""
         user_drafts_file = self.drafts_dir / f"{user_id}_drafts.json"
@@ -361,6 +375,119 @@ class MemoryManager:
         except (json.JSONDecodeError, IOError):
             return []
 
+    def load_draft_previews(
+        self, user_id: str, limit: int = 3, preview_chars: int = 80
+    ) -> List[Dict[str, Any]]:
+        """Load the most recent drafts as lightweight previews.
+
+        Each preview has ``id``, ``created_at``, ``metadata`` and the first
+        ``preview_chars`` characters of the content. The database path only
+        selects those columns and truncates the content server-side.
+
+        Returns:
+            List of preview dictionaries (most recent first)
+        """
+        if self._use_db:
+            try:
+                return self._load_draft_previews_db(user_id, limit, preview_chars)
+            except Exception as e:
+                logger.error(f"Failed to load draft previews from database: {e}")
+                logger.info("Falling back to JSON file storage")
+
+        # Fallback to JSON files
+        return [
+            {
+                "id": d.get("id"),
+                "created_at": d.get("created_at"),
+                "metadata": d.get("metadata", {}),
+                "content": (d.get("content") or "")[:preview_chars],
+            }
+            for d in self._load_drafts_json(user_id, limit)
+        ]
+
+    def _load_draft_previews_db(
+        self, user_id: str, limit: int, preview_chars: int
+    ) -> List[Dict[str, Any]]:
+        """Load draft previews from PostgreSQL database."""
+        from src.db.models import Draft
+
+        db = self._get_db()
+        if not db:
+            raise RuntimeError("Database session not available")
+
+        try:
+            query = (
+                db.query(
+                    Draft.id,
+                    Draft.created_at,
+                    Draft.draft_metadata,
+                    func.substr(Draft.content, 1, preview_chars),
+                )
+                .filter_by(user_id=user_id)
+                .order_by(desc(Draft.created_at))
+                .limit(limit)
+            )
+            rows = query.all()
+            if not rows and self._migrate_legacy_drafts(db, user_id):
+                rows = query.all()
+            return [
+                {
+                    "id": draft_id,
+                    "created_at": created_at.isoformat() if created_at else None,
+                    "metadata": metadata or {},
+                    "content": preview or "",
+                }
+                for draft_id, created_at, metadata, preview in rows
+            ]
+        finally:
+            if self.db_session is None:  # Close only if we created it
+                db.close()
+
+    def count_drafts(self, user_id: str) -> int:
+        """Return how many drafts are stored for a user.
+
+        Cheaper than ``len(load_drafts(user_id))``: the database path issues a
+        COUNT query instead of materializing every draft.
+        """
+        if self._use_db:
+            try:
+                return self._count_drafts_db(user_id)
+            except Exception as e:
+                logger.error(f"Failed to count drafts in database: {e}")
+                logger.info("Falling back to JSON file storage")
+
+        # Fallback to JSON files
+        return self._count_drafts_json(user_id)
+
+    def _count_drafts_db(self, user_id: str) -> int:
+        """Count drafts in PostgreSQL database."""
+        from src.db.models import Draft
+
+        db = self._get_db()
+        if not db:
+            raise RuntimeError("Database session not available")
+
+        try:
+            query = db.query(Draft).filter_by(user_id=user_id)
+            count = query.count()
+            if not count and self._migrate_legacy_drafts(db, user_id):
+                count = query.count()
+            return count
+        finally:
+            if self.db_session is None:  # Close only if we created it
+                db.close()
+
+    def _count_drafts_json(self, user_id: str) -> int:
+        """Count drafts in JSON file (fallback)."""
+        user_drafts_file = self.drafts_dir / f"{user_id}_drafts.json"
+        if not user_drafts_file.exists():
+            return 0
+        try:
+            with open(user_drafts_file, "r") as f:
+                return len(json.load(f))
+        except (json.JSONDecodeError, IOError):
+            return 0
+
     def clear_drafts(self, user_id: str) -> None:
         """Remove all persisted drafts for a user.
         
@@ -0,0 +1,133 @@
+"""Request-coalescing batcher for concurrent LLM calls.
+
+When several users compose at the same time, each pipeline stage issues the
+same prompt template with different inputs. PromptBatcher groups concurrent
+submissions that share a key (e.g. prompt template + model) and hands them to a
+single flush callable, which can send them as one batched request.
+
+The batcher is synchronous and thread-based to match LLMWrapper: the first
+caller for a key becomes the batch leader, waits up to ``max_wait_ms`` (or
+until ``max_batch`` items are queued), then flushes on behalf of everyone in
+the batch. Followers simply block until their result is ready.
+
+Usage:
+    from src.utils.batcher import PromptBatcher
+
+    def flush(key, payloads):
+        return chain.batch(payloads)
+
+    batcher = PromptBatcher(flush, max_batch=16, max_wait_ms=50)
+    result = batcher.submit("review", {"draft": "..."})
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Sequence
+
+
+class _Pending:
+    __slots__ = ("payload", "done", "result", "error")
+
+    def __init__(self, payload: Any) -> None:
+        self.payload = payload
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class PromptBatcher:
+    def __init__(
+        self,
+        flush_fn: Callable[[Hashable, List[Any]], Sequence[Any]],
+        max_batch: int = 16,
+        max_wait_ms: int = 50,
+    ) -> None:
+        """Create a batcher.
+
+        Args:
+            flush_fn: Called as ``flush_fn(key, payloads)``; must return one
+                result (or exception) per payload, in order.
+            max_batch: Flush as soon as this many items are queued for a key.
+            max_wait_ms: Longest time the leader waits for more items.
+        """
+        self.flush_fn = flush_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0, max_wait_ms) / 1000.0
+        self._cv = threading.Condition()
+        self._queues: Dict[Hashable, List[_Pending]] = {}
+
+    def submit(self, key: Hashable, payload: Any) -> Any:
+        """Queue ``payload`` under ``key`` and block until its result is ready.
+
+        Exceptions raised by the flush callable are re-raised in every caller
+        of the affected batch. A result that is itself an exception is raised
+        only in the caller it belongs to.
+        """
+        item = _Pending(payload)
+        with self._cv:
+            queue = self._queues.get(key)
+            leader = queue is None
+            if leader:
+                queue = self._queues[key] = []
+            queue.append(item)
+            if len(queue) >= self.max_batch:
+                self._cv.notify_all()
+
+            if leader:
+                deadline = time.monotonic() + self.max_wait
+                while len(queue) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cv.wait(timeout=remaining)
+                # Detach the batch; later submitters start a new one
+                batch = queue[: self.max_batch]
+                rest = queue[self.max_batch:]
+                if rest:
+                    self._queues[key] = rest
+                else:
+                    del self._queues[key]
+
+        if not leader:
+            item.done.wait()
+            if item.error is not None:
+                raise item.error
+            return item.result
+
+        self._flush(key, batch)
+        # Overflow items still need a leader; hand them to the first of them
+        if rest:
+            threading.Thread(target=self._drain, args=(key,), daemon=True).start()
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    def _drain(self, key: Hashable) -> None:
+        with self._cv:
+            queue = self._queues.pop(key, None)
+        while queue:
+            self._flush(key, queue[: self.max_batch])
+            queue = queue[self.max_batch:]
+
+    def _flush(self, key: Hashable, batch: List[_Pending]) -> None:
+        try:
+            results = list(self.flush_fn(key, [p.payload for p in batch]))
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batch flush returned {len(results)} results for {len(batch)} prompts"
+                )
+            for pending, result in zip(batch, results):
+                if isinstance(result, BaseException):
+                    pending.error = result
+                else:
+                    pending.result = result
+        except BaseException as exc:  # noqa: BLE001 - propagate to every caller
+            for pending in batch:
+                pending.error = exc
+        finally:
+            for pending in batch:
+                pending.done.set()
+
+
+__all__ = ["PromptBatcher"]
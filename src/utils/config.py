@@ -1,13 +1,22 @@
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
-from typing import Optional, List, Union
+from typing import Dict, Optional, List, Tuple, Union
+from functools import lru_cache
 import json
+import os
 
 class Settings(BaseSettings):
     # API Configuration
     gemini_api_key: str
     #gemini_model: str = "gemini-2.0-flash"
     gemini_model: str = "gemini-2.0-flash-lite"
+    # Optional cheaper model for closed-label classification stages
+    # (intent detection, routing). Unset means every stage uses gemini_model.
+    gemini_fast_model: Optional[str] = None
+    # Optional Gemini CachedContent name ("cachedContents/...") holding a shared
+    # static prompt prefix; cached input tokens are billed at the reduced rate.
+    # Applies to gemini_model only (caches are bound to one model).
+    gemini_cached_content: Optional[str] = None
 
     # Application Settings
     app_name: str = "AI Email Assistant"
@@ -44,6 +53,23 @@ class Settings(BaseSettings):
     tokens_per_minute: int = 60000  # adjustable TPM soft limit (estimate)
     max_concurrency: int = 4  # simple parallelism guard
     rate_limiter_jitter_ms: int = 150  # small jitter to avoid thundering herd
+    fast_model_requests_per_minute: int = 60  # limits for gemini_fast_model
+    fast_model_tokens_per_minute: int = 120000
+
+    # Prompt batching (coalesce concurrent calls sharing a prompt template)
+    enable_prompt_batching: bool = False
+    prompt_batch_max_size: int = 16  # flush once this many prompts are queued
+    prompt_batch_max_wait_ms: int = 50  # longest a batch waits for more prompts
+
+    # Semantic response cache (skip LLM calls for near-duplicate requests)
+    enable_semantic_cache: bool = False
+    semantic_cache_threshold: float = 0.92  # minimum cosine similarity for a hit
+    semantic_cache_ttl: int = 3600  # seconds
+    semantic_cache_max_entries: int = 1000
+
+    # Prompt compression (LLMLingua pruning of reference context in prompts)
+    enable_prompt_compression: bool = False
+    prompt_compression_rate: float = 0.5  # fraction of context tokens to keep
 
     # Metrics persistence
     metrics_output_dir: str = "data/metrics"
@@ -90,6 +116,10 @@ class Settings(BaseSettings):
     chromadb_host: str = "localhost"
     chromadb_port: int = 8000
     chromadb_use_server: bool = False  # True for server mode, False for persistent local
+    chroma_index_workers: int = 4  # background threads for draft indexing
+    chroma_flush_interval_ms: int = 200  # max delay before queued drafts are upserted
+    chroma_flush_batch_size: int = 32  # upsert immediately once this many are queued
+    chroma_embed_concurrency: int = 16  # in-flight per-text embedding requests
     
     # MongoDB Configuration (alternative to local storage)
     enable_mongodb: bool = False
@@ -216,7 +246,35 @@ class Settings(BaseSettings):
         case_sensitive = False
         extra = "ignore"  # Ignore extra env vars not defined as fields
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings (validated once, on first call)."""
+    return Settings()
+
+
+settings = get_settings()
+
+# path -> ((mtime_ns, size), Settings) for settings_from_env_file
+_env_file_settings: Dict[str, Tuple[Tuple[int, int], Settings]] = {}
+
+
+def settings_from_env_file(path: str) -> Settings:
+    """Return Settings loaded from a specific .env file.
+
+    The result is cached per path and reused while the file's mtime and size
+    are unchanged, so repeated loads of the same file (e.g. across tests) parse
+    it once. Process env vars still take precedence, but changing them does not
+    invalidate the cache.
+    """
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _env_file_settings.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    loaded = Settings(_env_file=path)
+    _env_file_settings[path] = (stamp, loaded)
+    return loaded
+
 
 # Derived convenience accessors (non-failing if user does not set env vars)
 def pricing_for_model(model_name: str, settings: Settings = settings) -> dict:
@@ -231,4 +289,4 @@ def pricing_for_model(model_name: str, settings: Settings = settings) -> dict:
         "output_per_million": settings.price_output_per_million,
     }
 
-__all__ = ["Settings", "settings", "pricing_for_model"]
+__all__ = ["Settings", "settings", "get_settings", "settings_from_env_file", "pricing_for_model"]
@@ -0,0 +1,32 @@
+"""Process environment loading shared by scripts and entry points.
+
+``loaded_env()`` runs ``load_dotenv()`` at most once per process and returns a
+snapshot of the resulting environment, so callers that need several variables
+read a plain dict instead of re-parsing ``.env`` or hitting ``os.environ``
+repeatedly.
+"""
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
+
+try:
+    from dotenv import load_dotenv
+except Exception:  # pragma: no cover - optional dependency
+    load_dotenv = None  # type: ignore
+
+
+@lru_cache(maxsize=1)
+def loaded_env() -> Mapping[str, str]:
+    """Load ``.env`` once and return a read-only snapshot of the environment.
+
+    On Railway the platform injects the variables, so ``.env`` is not read.
+    """
+    if load_dotenv is not None and not os.getenv("RAILWAY_ENVIRONMENT"):
+        load_dotenv()
+    return MappingProxyType(dict(os.environ))
+
+
+__all__ = ["loaded_env"]
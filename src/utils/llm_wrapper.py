@@ -28,9 +28,11 @@ This module is safe to import into agents and the workflow. Agents should adopt
 from __future__ import annotations
 
 import re
+import threading
 import time
 import logging
-from typing import Any, Callable, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Iterator, List, Optional, Tuple
 
 from .config import settings
 from .metrics import metrics
@@ -39,9 +41,24 @@ try:
     from .rate_limiter import RateLimiter
 except Exception:  # pragma: no cover - defensive import
     RateLimiter = None  # type: ignore
+from .batcher import PromptBatcher
 
 logger = logging.getLogger(__name__)
 
+# Server-suggested retry delays, tried in order (see _parse_retry_delay)
+_RETRY_DELAY_PATTERNS = tuple(
+    re.compile(pat, re.IGNORECASE)
+    for pat in (
+        r"retry in\s*(\d+(?:\.\d+)?)s",
+        r"please retry in\s*(\d+(?:\.\d+)?)s",
+        r"retry_after[:=]\s*(\d+(?:\.\d+)?)",
+        r"retry-after[:=]\s*(\d+(?:\.\d+)?)",
+        r"seconds:\s*(\d+(?:\.\d+)?)",
+    )
+)
+# Last resort: a number following 'retry' within 30 chars
+_RETRY_NUMBER_RE = re.compile(r"retry[^\d\n\r]{0,30}(\d+(?:\.\d+)?)", re.IGNORECASE)
+
 
 class LLMWrapperError(Exception):
     """Generic wrapper-level exception."""
@@ -55,6 +72,8 @@ class LLMWrapper:
         initial_backoff: float = 1.0,
         backoff_factor: float = 2.0,
         max_backoff: float = 60.0,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
     ) -> None:
         """Create an LLM wrapper.
 
@@ -64,6 +83,8 @@ class LLMWrapper:
             initial_backoff: Starting backoff in seconds.
             backoff_factor: Multiplicative factor for exponential backoff.
             max_backoff: Maximum backoff in seconds.
+            requests_per_minute, tokens_per_minute: Optional rate limiter
+                overrides for models with their own quotas.
         """
         self.llm = llm
         self.max_retries = max_retries
@@ -75,16 +96,19 @@ class LLMWrapper:
         if getattr(settings, "enable_rate_limiter", False) and RateLimiter is not None:
             try:
                 self._rate_limiter = RateLimiter(
-                    rpm=settings.requests_per_minute,
-                    tpm=settings.tokens_per_minute,
+                    rpm=requests_per_minute or settings.requests_per_minute,
+                    tpm=tokens_per_minute or settings.tokens_per_minute,
                     max_concurrency=settings.max_concurrency,
                     jitter_ms=settings.rate_limiter_jitter_ms,
                 )
             except Exception:
                 logger.exception("Failed to initialize RateLimiter; proceeding without client-side limits.")
                 self._rate_limiter = None
+        # Shared across wrappers so concurrent users' calls can coalesce
+        self._batcher = _get_batcher() if getattr(settings, "enable_prompt_batching", False) else None
 
-    def _parse_retry_delay(self, exc: Exception) -> Optional[float]:
+    @staticmethod
+    def _parse_retry_delay(exc: Exception) -> Optional[float]:
         """Try to parse a server-suggested retry delay from the exception message.
 
         Heuristics:
@@ -102,25 +126,15 @@ class LLMWrapper:
         if not text:
             return None
 
-        # Common patterns
-        patterns = [
-            r"retry in\s*(\d+(?:\.\d+)?)s",
-            r"please retry in\s*(\d+(?:\.\d+)?)s",
-            r"retry_after[:=]\s*(\d+(?:\.\d+)?)",
-            r"retry-after[:=]\s*(\d+(?:\.\d+)?)",
-            r"seconds:\s*(\d+(?:\.\d+)?)",
-        ]
-
-        for pat in patterns:
-            m = re.search(pat, text, flags=re.IGNORECASE)
+        for pattern in _RETRY_DELAY_PATTERNS:
+            m = pattern.search(text)
             if m:
                 try:
                     return float(m.group(1))
                 except Exception:
                     continue
 
-        # Last resort: look for a number following 'retry' within 30 chars
-        m = re.search(r"retry[^\d\n\r]{0,30}(\d+(?:\.\d+)?)", text, flags=re.IGNORECASE)
+        m = _RETRY_NUMBER_RE.search(text)
         if m:
             try:
                 return float(m.group(1))
@@ -206,6 +220,11 @@ class LLMWrapper:
         if not hasattr(chain, "invoke"):
             raise ValueError("Provided chain does not have an 'invoke' method")
 
+        if self._batcher is not None and hasattr(chain, "batch") and not retry_kwargs:
+            # Calls built from the same prompt object and LLM share a batch
+            key = (id(getattr(chain, "first", chain)), id(getattr(chain, "last", self.llm)))
+            return self._batcher.submit(key, (self, chain, params))
+
         # Token estimate for rate limiter pre-check (best-effort)
         est_in_tokens = self._estimate_input_tokens(params)
 
@@ -239,29 +258,12 @@ class LLMWrapper:
             # Always attempt to record metrics after the call (success or error)
             latency_ms = (time.time() - start) * 1000.0
             try:
-                if hasattr(chain, "_lc_kwargs") and isinstance(chain._lc_kwargs, dict):  # type: ignore[attr-defined]
-                    model_name = getattr(self.llm, "model", None) or chain._lc_kwargs.get("model") or "unknown"
-                else:
-                    model_name = getattr(self.llm, "model", None) or "unknown"
-
-                in_tok, out_tok = self._extract_token_usage(result if 'result' in locals() else None)
-                # Fallback to estimates when usage not available
-                if in_tok is None:
-                    in_tok = est_in_tokens
-                if out_tok is None:
-                    out_tok = self._estimate_output_tokens(result) if 'result' in locals() else 0
-
-                cost = 0.0
-                if getattr(settings, "enable_cost_tracking", False):
-                    cost = metrics.compute_cost(model_name, in_tok, out_tok)
-
-                metrics.record_call(
-                    model=model_name,
-                    latency_ms=latency_ms,
-                    input_tokens=int(in_tok or 0),
-                    output_tokens=int(out_tok or 0),
-                    cost_usd=float(cost or 0.0),
-                    error=error_msg,
+                self._record_metrics(
+                    chain,
+                    result if 'result' in locals() else None,
+                    est_in_tokens,
+                    latency_ms,
+                    error_msg,
                 )
             except Exception:
                 # Never fail user flow due to metrics
@@ -274,7 +276,150 @@ class LLMWrapper:
                 except Exception:
                     pass
 
+    def stream_chain(self, chain: Any, params: dict) -> Iterator[str]:
+        """Yield the chain's output text chunk by chunk as the model decodes it.
+
+        Takes one rate-limiter slot for the life of the stream. Failures are
+        not retried: once chunks have been handed out a retry would repeat
+        them, so callers fall back on error instead.
+        """
+        if not hasattr(chain, "stream"):
+            raise ValueError("Provided chain does not have a 'stream' method")
+
+        est_in_tokens = self._estimate_input_tokens(params)
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire(est_in_tokens)
+
+        start = time.time()
+        error_msg: Optional[str] = None
+        parts: List[str] = []
+        try:
+            for chunk in chain.stream(params):
+                text = getattr(chunk, "content", chunk)
+                if text:
+                    text = str(text)
+                    parts.append(text)
+                    yield text
+        except Exception as exc:
+            error_msg = str(exc)
+            raise
+        finally:
+            latency_ms = (time.time() - start) * 1000.0
+            try:
+                self._record_metrics(
+                    chain,
+                    {"content": "".join(parts)},
+                    est_in_tokens,
+                    latency_ms,
+                    error_msg,
+                )
+            except Exception:
+                logger.debug("Metrics recording failed", exc_info=True)
+            finally:
+                try:
+                    if self._rate_limiter is not None:
+                        self._rate_limiter.release()
+                except Exception:
+                    pass
+
+    def invoke_batch(
+        self,
+        chain: Any,
+        params_list: List[dict],
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Run several inputs through ``chain.batch`` as one rate-limited call.
+
+        The whole batch takes a single RPM/concurrency slot while the TPM
+        estimate is the sum of the per-prompt estimates; ``chain.batch`` runs
+        at most ``settings.max_concurrency`` requests at once within it.
+        Inputs that fail are retried individually, so one bad prompt does not
+        re-run the others.
+
+        Args:
+            chain: Runnable exposing ``batch`` and ``invoke``.
+            params_list: One params dict per prompt.
+            return_exceptions: Put a failed input's exception in its slot of
+                the result list instead of raising the first one.
+        """
+        estimates = [self._estimate_input_tokens(p) for p in params_list]
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire(sum(estimates))
+
+        start = time.time()
+        results: List[Any] = []
+        try:
+            results = list(chain.batch(
+                params_list,
+                config={"max_concurrency": max(1, settings.max_concurrency)},
+                return_exceptions=True,
+            ))
+            for i, result in enumerate(results):
+                if isinstance(result, Exception):
+                    try:
+                        results[i] = self.run_with_retries(chain.invoke, params_list[i])
+                    except Exception as exc:
+                        results[i] = exc
+        except Exception as exc:
+            results = [exc] * len(params_list)
+        finally:
+            latency_ms = (time.time() - start) * 1000.0
+            try:
+                for i, est in enumerate(estimates):
+                    result = results[i] if i < len(results) else None
+                    if isinstance(result, Exception):
+                        self._record_metrics(chain, None, est, latency_ms, str(result))
+                    else:
+                        self._record_metrics(chain, result, est, latency_ms, None)
+            except Exception:
+                logger.debug("Metrics recording failed", exc_info=True)
+            finally:
+                try:
+                    if self._rate_limiter is not None:
+                        self._rate_limiter.release()
+                except Exception:
+                    pass
+
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
     # ---- Helpers ----
+    def _record_metrics(
+        self,
+        chain: Any,
+        result: Any,
+        est_in_tokens: int,
+        latency_ms: float,
+        error_msg: Optional[str],
+    ) -> None:
+        if hasattr(chain, "_lc_kwargs") and isinstance(chain._lc_kwargs, dict):  # type: ignore[attr-defined]
+            model_name = getattr(self.llm, "model", None) or chain._lc_kwargs.get("model") or "unknown"
+        else:
+            model_name = getattr(self.llm, "model", None) or "unknown"
+
+        in_tok, out_tok = self._extract_token_usage(result)
+        # Fallback to estimates when usage not available
+        if in_tok is None:
+            in_tok = est_in_tokens
+        if out_tok is None:
+            out_tok = self._estimate_output_tokens(result)
+
+        cost = 0.0
+        if getattr(settings, "enable_cost_tracking", False):
+            cost = metrics.compute_cost(model_name, in_tok, out_tok)
+
+        metrics.record_call(
+            model=model_name,
+            latency_ms=latency_ms,
+            input_tokens=int(in_tok or 0),
+            output_tokens=int(out_tok or 0),
+            cost_usd=float(cost or 0.0),
+            error=error_msg,
+        )
+
     def _estimate_input_tokens(self, params: dict) -> int:
         try:
             if not params:
@@ -362,7 +507,52 @@ class LLMWrapper:
         return in_tok, out_tok
 
 
+_batcher: Optional[PromptBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def _flush_prompt_batch(key: Any, payloads: List[Tuple[LLMWrapper, Any, dict]]) -> List[Any]:
+    wrapper, chain, _ = payloads[0]
+    # Failures stay per prompt; the batcher raises each one in its own caller
+    return wrapper.invoke_batch(chain, [params for _, _, params in payloads], return_exceptions=True)
+
+
+def _get_batcher() -> PromptBatcher:
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = PromptBatcher(
+                    _flush_prompt_batch,
+                    max_batch=settings.prompt_batch_max_size,
+                    max_wait_ms=settings.prompt_batch_max_wait_ms,
+                )
+    return _batcher
+
+
 # Simple module-level factory for convenience
 def make_wrapper(llm: Any, **kwargs) -> LLMWrapper:
     """Factory helper to create an LLMWrapper quickly."""
     return LLMWrapper(llm, **kwargs)
+
+
+@lru_cache(maxsize=4)
+def get_llm(
+    model: str,
+    api_key: str,
+    temperature: Optional[float] = None,
+    max_tokens: Optional[int] = None,
+) -> Any:
+    """Return a shared ChatGoogleGenerativeAI for this configuration.
+
+    Building the client sets up transport, credentials and retry policy, so
+    repeat callers with the same arguments get the same instance.
+    """
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    kwargs: dict = {"model": model, "google_api_key": api_key}
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    if max_tokens is not None:
+        kwargs["max_output_tokens"] = max_tokens
+    return ChatGoogleGenerativeAI(**kwargs)
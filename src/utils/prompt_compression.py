@@ -0,0 +1,89 @@
+"""Shrink reference material before it is sent to the model.
+
+Only text the model reads but does not rewrite is compressed, such as the
+past-draft examples personalization passes as ``reference_context``. Drafts
+the model rewrites into the email go through untouched: pruned or reflowed
+input would show up in the output. Two levels of compression apply:
+
+- Whitespace compaction, always on: trailing spaces, runs of spaces/tabs and
+  stacks of blank lines are collapsed. Paragraph breaks are kept, so the model
+  sees the same structure.
+- LLMLingua token pruning, opt-in via ``ENABLE_PROMPT_COMPRESSION``: drops
+  low-information tokens down to ``PROMPT_COMPRESSION_RATE`` of the original.
+  Only used when the ``llmlingua`` package is installed and the text is long
+  enough for the saving to outweigh the local compressor pass.
+
+Usage:
+    from src.utils.prompt_compression import compress_context
+    params = {"reference_context": compress_context(context), ...}
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Text shorter than this skips LLMLingua: pruning a handful of sentences
+# saves little and costs a local model pass.
+_MIN_LINGUA_CHARS = 600
+
+_INLINE_SPACE_RE = re.compile(r"[ \t\f\v]+")
+_TRAILING_SPACE_RE = re.compile(r"[ \t]+\n")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+_compressor: Optional[Any] = None
+_compressor_lock = threading.Lock()
+
+
+def compact_whitespace(text: str) -> str:
+    """Collapse redundant whitespace while keeping line and paragraph breaks."""
+    text = text.replace("\r\n", "\n")
+    text = _INLINE_SPACE_RE.sub(" ", text)
+    text = _TRAILING_SPACE_RE.sub("\n", text)
+    return _BLANK_LINES_RE.sub("\n\n", text).strip()
+
+
+def _get_compressor() -> Optional[Any]:
+    global _compressor
+    if _compressor is None:
+        with _compressor_lock:
+            if _compressor is None:
+                try:
+                    # Imported here: llmlingua pulls in torch/transformers
+                    from llmlingua import PromptCompressor
+                    _compressor = PromptCompressor(
+                        model_name="microsoft/llmlingua-2-xlm-roberta-large-meetingbank",
+                        use_llmlingua2=True,
+                        device_map="cpu",
+                    )
+                except Exception:
+                    logger.warning("LLMLingua unavailable; prompt compression disabled.", exc_info=True)
+                    _compressor = False
+    return _compressor or None
+
+
+def compress_context(context: str) -> str:
+    """Return the prompt copy of ``context``: compacted, and pruned when enabled."""
+    if not context:
+        return context
+    text = compact_whitespace(context)
+
+    from .config import settings
+    if not getattr(settings, "enable_prompt_compression", False) or len(text) < _MIN_LINGUA_CHARS:
+        return text
+    compressor = _get_compressor()
+    if compressor is None:
+        return text
+    try:
+        result = compressor.compress_prompt(
+            text,
+            rate=settings.prompt_compression_rate,
+            force_tokens=["\n", ".", ",", "?", "!"],
+        )
+        return result.get("compressed_prompt") or text
+    except Exception:
+        logger.debug("Prompt compression failed; using compacted text", exc_info=True)
+        return text
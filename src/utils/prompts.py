@@ -1,13 +1,24 @@
 """
 Prompt templates for various agents in the email assistant workflow.
 These templates are used by LLM agents to generate structured outputs.
+
+The *_PROMPT ChatPromptTemplates are built on first access (module
+__getattr__) rather than at import, so workers only pay for the prompts
+they actually use.
 """
 
-from langchain.prompts import ChatPromptTemplate
+import string
+import sys
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+   from langchain.prompts import ChatPromptTemplate
 
 # Input Parser Prompt (shared across InputParserAgent)
-INPUT_PARSER_PROMPT = ChatPromptTemplate.from_template(
-   """
+_INPUT_PARSER_TEMPLATE = """
    You are an expert at understanding email composition requests.
 
    Extract the following information from the user's request:
@@ -31,11 +42,9 @@ INPUT_PARSER_PROMPT = ChatPromptTemplate.from_template(
 
    Be thorough but concise. If information isn't provided, use reasonable defaults.
    """
-)
 
 # Intent Detector Prompt (shared across IntentDetectorAgent)
-INTENT_DETECTOR_PROMPT = ChatPromptTemplate.from_template(
-   """
+_INTENT_DETECTOR_TEMPLATE = """
    You are an expert at classifying email intents.
 
    Based on the email purpose and context, classify the intent into ONE of these categories:
@@ -48,175 +57,176 @@ INTENT_DETECTOR_PROMPT = ChatPromptTemplate.from_template(
    Respond with ONLY the intent category name (e.g., "outreach", "follow_up", etc.).
    No explanation needed. Just the exact category name.
    """
-)
 
 # Draft Writer Prompts by Intent
-OUTREACH_PROMPT = """Write a professional outreach email with this structure:
+# Each intent contributes its structure and a length hint; the shared footer
+# carries the request fields so the variable tail is identical across intents.
+_INTENT_FOOTER = """Recipient: {{recipient}}
+Purpose: {{purpose}}
+Key Points: {{key_points}}
+Tone: {tone}
+
+{note}TARGET LENGTH: About {{target_length}} words ({length_hint}).
+"""
+
+_INTENT_BODIES = {
+   "outreach": ("""Write a professional outreach email with this structure:
 
 1. Personalized opening (reference recipient's work/company if known)
 2. Brief self-introduction (generic if not provided)
 3. Clear value proposition
 4. Specific ask or next step
-5. Professional closing
-
-Recipient: {recipient}
-Purpose: {purpose}
-Key Points: {key_points}
-Tone: {tone}
-
-IMPORTANT: Do NOT use placeholder brackets like [Your Name], [Company Name], etc. If information is missing, write naturally without placeholders. Personalization occurs later.
-TARGET LENGTH: Aim for approximately {target_length} words (do not exceed by >10%).
-"""
-
-FOLLOWUP_PROMPT = """Write a follow-up email that:
+5. Professional closing""", "do not exceed by >10%"),
+   "follow_up": ("""Write a follow-up email that:
 
 1. References previous interaction/email
 2. Provides context reminder
 3. Adds new value or information
 4. Includes clear call-to-action
-5. Shows respect for their time
-
-Recipient: {recipient}
-Purpose: {purpose}
-Key Points: {key_points}
-Tone: {tone}
-
-TARGET LENGTH: About {target_length} words (concise, non-pushy).
-"""
-
-THANKYOU_PROMPT = """Write a genuine thank you email that:
+5. Shows respect for their time""", "concise, non-pushy"),
+   "thank_you": ("""Write a genuine thank you email that:
 
 1. Opens with sincere gratitude
 2. Specifically mentions what you're thanking them for
 3. Explains the impact or value
 4. Offers reciprocity if appropriate
-5. Warm closing
-
-Recipient: {recipient}
-Purpose: {purpose}
-Key Points: {key_points}
-Tone: {tone}
-
-TARGET LENGTH: About {target_length} words (warm and authentic).
-"""
-
-MEETING_REQUEST_PROMPT = """Write a meeting request email that:
+5. Warm closing""", "warm and authentic"),
+   "meeting_request": ("""Write a meeting request email that:
 
 1. Clear subject line suggestion
 2. Brief context for the meeting
 3. Proposed agenda or topics
 4. Specific time options or scheduling link
-5. Expected duration
-
-Recipient: {recipient}
-Purpose: {purpose}
-Key Points: {key_points}
-Tone: {tone}
-
-TARGET LENGTH: About {target_length} words (organized, respectful).
-"""
-
-APOLOGY_PROMPT = """Write a sincere apology email that:
+5. Expected duration""", "organized, respectful"),
+   "apology": ("""Write a sincere apology email that:
 
 1. Takes clear responsibility
 2. Acknowledges the impact
 3. Explains what happened (briefly, no excuses)
 4. Describes corrective action
-5. Asks for another chance
-
-Recipient: {recipient}
-Purpose: {purpose}
-Key Points: {key_points}
-Tone: empathetic and professional
-
-TARGET LENGTH: About {target_length} words (genuine and concise).
-"""
-
-INFORMATION_REQUEST_PROMPT = """Write an information request email that:
+5. Asks for another chance""", "genuine and concise"),
+   "information_request": ("""Write an information request email that:
 
 1. Polite opening
 2. Context for your request
 3. Specific questions or information needed
 4. Why you're asking them specifically
-5. Appreciation for their time
-
-Recipient: {recipient}
-Purpose: {purpose}
-Key Points: {key_points}
-Tone: {tone}
-
-IMPORTANT: Do NOT use placeholder brackets. If information is not provided, write naturally.
-TARGET LENGTH: About {target_length} words (clear and respectful).
-"""
-
-# Additional templates added to support all intents used by DraftWriterAgent
-STATUS_UPDATE_PROMPT = """Write a professional status update email that:
+5. Appreciation for their time""", "clear and respectful"),
+   "status_update": ("""Write a professional status update email that:
 
 1. Clear opening about the update
 2. Current status/progress summary
 3. Key accomplishments or milestones
 4. Next steps or upcoming actions
-5. Call to action if needed
-
-Recipient: {recipient}
-Purpose: {purpose}
-Key Points: {key_points}
-Tone: {tone}
-
-TARGET LENGTH: About {target_length} words (concise and structured).
-"""
-
-INTRODUCTION_PROMPT = """Write a professional introduction email that:
+5. Call to action if needed""", "concise and structured"),
+   "introduction": ("""Write a professional introduction email that:
 
 1. Warm, personalized opening
 2. Brief background about yourself
 3. How you learned about or were referred to the recipient
 4. Shared interests or mutual connections
-5. Soft ask or invitation to connect
-
-Recipient: {recipient}
-Purpose: {purpose}
-Key Points: {key_points}
-Tone: {tone}
-
-TARGET LENGTH: About {target_length} words (genuine and engaging).
-"""
-
-NETWORKING_PROMPT = """Write a professional networking email that:
+5. Soft ask or invitation to connect""", "genuine and engaging"),
+   "networking": ("""Write a professional networking email that:
 
 1. Personalized compliment or reference
 2. Why you admire their work
 3. What you're doing and shared interests
 4. Suggested ways to stay connected
-5. Open invitation to coffee/call
-
-Recipient: {recipient}
-Purpose: {purpose}
-Key Points: {key_points}
-Tone: {tone}
-
-TARGET LENGTH: About {target_length} words (authentic and conversational).
-"""
-
-COMPLAINT_PROMPT = """Write a professional complaint email that:
+5. Open invitation to coffee/call""", "authentic and conversational"),
+   "complaint": ("""Write a professional complaint email that:
 
 1. Respectful, non-accusatory opening
 2. Clear description of the issue
 3. Impact or consequences
 4. Specific resolution requested
-5. Timeline and contact information
-
-Recipient: {recipient}
-Purpose: {purpose}
-Key Points: {key_points}
-Tone: assertive and professional
-
-TARGET LENGTH: About {target_length} words (firm but constructive).
-"""
+5. Timeline and contact information""", "firm but constructive"),
+}
+
+# Intents whose tone is fixed regardless of the requested tone
+_INTENT_TONES = {
+   "apology": "empathetic and professional",
+   "complaint": "assertive and professional",
+}
+
+_INTENT_NOTES = {
+   "outreach": "IMPORTANT: Do NOT use placeholder brackets like [Your Name], [Company Name], etc. If information is missing, write naturally without placeholders. Personalization occurs later.\n",
+   "information_request": "IMPORTANT: Do NOT use placeholder brackets. If information is not provided, write naturally.\n",
+}
+
+
+@lru_cache(maxsize=16)
+def intent_prompt(name: str) -> str:
+   """Return the draft template for an intent: its body followed by the shared footer."""
+   body, length_hint = _INTENT_BODIES[name]
+   return body + "\n\n" + _INTENT_FOOTER.format(
+      tone=_INTENT_TONES.get(name, "{tone}"),
+      note=_INTENT_NOTES.get(name, ""),
+      length_hint=length_hint,
+   )
+
+
+OUTREACH_PROMPT = intent_prompt("outreach")
+FOLLOWUP_PROMPT = intent_prompt("follow_up")
+THANKYOU_PROMPT = intent_prompt("thank_you")
+MEETING_REQUEST_PROMPT = intent_prompt("meeting_request")
+APOLOGY_PROMPT = intent_prompt("apology")
+INFORMATION_REQUEST_PROMPT = intent_prompt("information_request")
+STATUS_UPDATE_PROMPT = intent_prompt("status_update")
+INTRODUCTION_PROMPT = intent_prompt("introduction")
+NETWORKING_PROMPT = intent_prompt("networking")
+COMPLAINT_PROMPT = intent_prompt("complaint")
+
+# Intent -> draft template lookup (consumed by DraftWriterAgent)
+DRAFT_PROMPTS = {name: intent_prompt(name) for name in _INTENT_BODIES}
+
+
+@lru_cache(maxsize=16)
+def _compiled_draft_prompt(intent: str) -> "ChatPromptTemplate":
+   from langchain.prompts import ChatPromptTemplate
+
+   return ChatPromptTemplate.from_template(DRAFT_PROMPTS[intent])
+
+
+def draft_prompt_for(intent: str) -> "ChatPromptTemplate":
+   """Return the compiled draft prompt for an intent (unknown intents use outreach)."""
+   return _compiled_draft_prompt(intent if intent in DRAFT_PROMPTS else "outreach")
+
+
+# Tone configuration guidelines (shared across ToneStylistAgent); read-only so
+# one copy serves every agent and cached prompt partial
+TONE_GUIDELINES = MappingProxyType({
+   "formal": MappingProxyType({
+      "characteristics": "Professional, structured, no contractions, proper titles",
+      "vocabulary": "sophisticated, traditional business language",
+      "structure": "well-organized with clear paragraphs",
+      "greeting": "Dear [Name] / Dear Sir/Madam",
+      "closing": "Sincerely / Best regards / Respectfully"
+   }),
+   "casual": MappingProxyType({
+      "characteristics": "Friendly, conversational, use contractions",
+      "vocabulary": "simple, everyday language",
+      "structure": "natural flow, shorter paragraphs",
+      "greeting": "Hi [Name] / Hey [Name]",
+      "closing": "Thanks / Cheers / Best"
+   }),
+   "assertive": MappingProxyType({
+      "characteristics": "Direct, confident, action-oriented, clear",
+      "vocabulary": "strong action verbs, decisive language",
+      "structure": "bullet points, clear CTAs",
+      "greeting": "Hello [Name]",
+      "closing": "Looking forward to your response / Let's move forward"
+   }),
+   "empathetic": MappingProxyType({
+      "characteristics": "Understanding, supportive, compassionate",
+      "vocabulary": "warm, acknowledging feelings",
+      "structure": "gentle flow, validating statements",
+      "greeting": "Dear [Name]",
+      "closing": "With understanding / Warm regards"
+   })
+})
 
 # Tone Stylist Prompt (shared across ToneStylistAgent)
-TONE_STYLIST_PROMPT = ChatPromptTemplate.from_template(
-   """
+_TONE_STYLIST_TEMPLATE = """
    You are an expert at adjusting email tone while preserving the core message.
 
    Original Draft:
@@ -241,11 +251,23 @@ TONE_STYLIST_PROMPT = ChatPromptTemplate.from_template(
 
    Return ONLY the rewritten email, no explanations.
    """
-)
 
-# Review Agent Prompt (shared across ReviewAgent)
-REVIEW_AGENT_PROMPT = ChatPromptTemplate.from_template(
+
+@lru_cache(maxsize=16)
+def _tone_stylist_partial(tone: str) -> "ChatPromptTemplate":
+   return _chat_prompt("TONE_STYLIST_PROMPT").partial(**TONE_GUIDELINES[tone])
+
+
+def tone_stylist_prompt_for(tone: str) -> "ChatPromptTemplate":
+   """Return TONE_STYLIST_PROMPT with the tone guidelines pre-bound.
+
+   Unknown tones use the formal guidelines. Callers only supply
+   draft, tone and target_length at invocation time.
    """
+   return _tone_stylist_partial(tone if tone in TONE_GUIDELINES else "formal")
+
+# Review Agent Prompt (shared across ReviewAgent)
+_REVIEW_AGENT_TEMPLATE = """
    You are an expert email reviewer and editor. Analyze this email draft and improve it if needed.
 
    Email Draft:
@@ -269,11 +291,9 @@ REVIEW_AGENT_PROMPT = ChatPromptTemplate.from_template(
 
    Return ONLY the final email draft (improved or original), no explanations.
    """
-)
 
 # Personalization Agent Prompt (shared across PersonalizationAgent)
-PERSONALIZATION_PROMPT = ChatPromptTemplate.from_template(
-   """
+_PERSONALIZATION_TEMPLATE = """
    You are personalizing an email draft with user-specific information.
 
    Original Draft:
@@ -291,95 +311,90 @@ PERSONALIZATION_PROMPT = ChatPromptTemplate.from_template(
 
    Target Length: {target_length} words (stay within ±5%)
 
-   CRITICAL INSTRUCTIONS for personalization:
-   1. Add the signature at the end
-   2. ONLY use profile fields that have actual values (not empty strings)
-   3. Use provided Name naturally in the body and signature
-   4. Use Title and Company only if non-empty
-   5. NEVER generate placeholder text like "[Your Name]" or bracketed tokens
-   6. Omit empty fields entirely
-   7. Match the user's preferred writing style
-   8. Keep the core message intact
-   9. Maintain the target length by condensing if necessary; do not significantly exceed it.
-   10. Do NOT alter the greeting line or the recipient name; preserve them exactly as in the original draft. Never substitute the recipient with the sender's name.
-   11. If similar emails are provided, use their tone/structure as inspiration only; do not reveal or re-use their recipients, names, or sensitive details.
+   Instructions:
+   1. Append the signature; use Name, Title and Company only where they have values, in the user's writing style, and never emit placeholder brackets.
+   2. Keep the core message and the target length; never alter the greeting line or recipient name, and never substitute the sender's name for the recipient.
+   3. Treat similar emails as tone/structure inspiration only; never reuse their recipients, names or private details.
 
    Return ONLY the personalized email with NO placeholder brackets.
    """
-)
-
-# Refinement Agent Prompt
-REFINEMENT_AGENT_PROMPT = ChatPromptTemplate.from_template("""
-You are an expert email refinement specialist. Refine the draft strictly according to the ordered tasks below. Do NOT invent new facts.
-
-Email Draft (to refine as needed):
-{draft}
 
-ORDERED REFINEMENT TASKS (perform in sequence; skip a task if not needed):
+# Fused tone + personalization prompt (FusedStyleAgent): one rewrite instead
+# of a tone pass followed by a personalization pass
+_FUSED_STYLE_TEMPLATE = """
+   You are adjusting an email's tone and personalizing it for the sender in a single rewrite.
 
-1. DEDUPLICATE CLOSINGS & SIGNATURES
-   - Keep only ONE closing/signature block at end (e.g., choose a single final block among: "Best regards", "Regards", "Sincerely", "Thank you", "Warm regards").
-   - If multiple appear, retain the first complete one with name/title; remove others.
-
-2. DEDUPLICATE GREETINGS
-   - If greeting lines repeat ("Hello Maria," / "Dear Team," etc.), keep the first valid greeting and remove subsequent duplicates.
-   - Do NOT alter the recipient name or greeting wording aside from removing duplicates.
+   Original Draft:
+   {draft}
 
-3. STRIP PLACEHOLDERS & TEMPLATE TOKENS
-   - Remove bracketed or angle/curly placeholder tokens like: [Your Name], [Company], {{Company Name}}, <Insert Value>, (Your Title), {{{{anything}}}}, <<anything>>.
-   - Remove obvious ALL-CAPS placeholder phrases of pattern: "YOUR ... HERE" or "INSERT ...".
-   - After removal, ensure surrounding punctuation and spacing are clean.
+   Target Tone: {tone}
+   Tone Guidelines:
+   - Characteristics: {characteristics}
+   - Vocabulary: {vocabulary}
+   - Structure: {structure}
+   - Greeting style: {greeting}
+   - Closing style: {closing}
 
-4. UNWRAP NESTED / REDUNDANT BRACKETS
-   - Convert [[[text]]], ((text)), {{{{text}}}}, <<text>>, [ [ text ] ], etc. to plain: text.
-   - Remove empty bracket pairs entirely ([], {{}}, (), <> alone).
+   Sender Profile:
+   - Name: {user_name}
+   - Title: {user_title}
+   - Company: {user_company}
+   - Signature: {signature}
+   - Writing Style Notes: {style_notes}
 
-5. CLEAN ORPHANED BRACKETS & EXTRANEOUS PUNCTUATION/SPACES
-   - Remove leftover solitary [, ], (, ), {{, }}, <, > that do not enclose content.
-   - Collapse multiple consecutive spaces to one.
-   - Replace sequences of more than three periods with an ellipsis "…" (single Unicode ellipsis) unless part of a quoted excerpt.
+   Optional Similar Past Emails (style/reference only; never copy private details):
+   {reference_context}
 
-6. MERGE REPETITIVE SENTENCES/CLAIMS
-   - If the same idea is repeated, keep the strongest, clearest version; remove the rest.
-   - Do NOT remove unique details (dates, metrics, commitments).
+   Target Length: {target_length} words (stay within ±5%)
 
-7. LIGHT GRAMMAR & SPELLING CORRECTION
-   - Fix spelling, agreement, punctuation, capitalization.
-   - Preserve tone and intent; do NOT expand content.
+   Instructions:
+   1. Rewrite to match the target tone while keeping every key point and a natural flow.
+   2. Append the signature; use Name, Title and Company only where they have values, in the sender's writing style, and never emit placeholder brackets.
+   3. Never alter the greeting line or recipient name, and never substitute the sender's name for the recipient.
+   4. Treat similar emails as tone/structure inspiration only; never reuse their recipients, names or private details.
 
-8. LENGTH & SAFETY GUARDS
-   - Aim to keep overall length within ±5% of original unless placeholder/bracket removal forces greater reduction.
-   - Never shorten more than necessary; never lengthen beyond minor grammar adjustments.
-   - Do NOT change greeting line or recipient name.
-   - Do NOT introduce new facts, promises, dates, links, or attachments.
+   Return ONLY the final email, no explanations.
+   """
 
-GENERAL RULES:
-- Preserve core meaning and professional tone.
-- Maintain any existing scheduling details, numbers, or commitments verbatim.
-- If no changes are required, return the draft exactly unchanged.
 
-OUTPUT:
-Return ONLY the refined email text. No explanations, no commentary, no markdown.
-""")
+@lru_cache(maxsize=16)
+def _fused_style_partial(tone: str) -> "ChatPromptTemplate":
+   return _chat_prompt("FUSED_STYLE_PROMPT").partial(**TONE_GUIDELINES[tone])
 
-# Fallback Draft Template
-FALLBACK_DRAFT_TEMPLATE = """Dear {recipient},
 
-I hope this email finds you well.
+def fused_style_prompt_for(tone: str) -> "ChatPromptTemplate":
+   """Return FUSED_STYLE_PROMPT with the tone guidelines pre-bound (unknown tones use formal)."""
+   return _fused_style_partial(tone if tone in TONE_GUIDELINES else "formal")
 
-{purpose}
+# Refinement Agent Prompt
+_REFINEMENT_AGENT_TEMPLATE = """
+Refine this email draft without inventing facts:
+{draft}
 
-{key_points}
+In order, skipping steps that are not needed:
+1. Keep exactly one closing/signature block (the first complete one).
+2. Remove duplicate greeting lines.
+3. Remove placeholders such as [...], {{...}}, <...>, "INSERT ..." and unwrap nested brackets; clean leftover brackets and spacing.
+4. Merge repeated sentences, keeping unique details.
+5. Fix grammar and spelling.
 
-I look forward to hearing from you.
+Preserve the greeting, recipient name, tone, facts, numbers and dates; keep length within ±5% unless removals force less.
+Output the refined email only, with no commentary or markdown. If nothing needs changing, return it unchanged.
+"""
 
-Best regards"""
+# Fallback Draft (used when the LLM is unavailable; no template parsing)
+def render_fallback(recipient, purpose, key_points):
+   """Render the plain-text fallback email for the given recipient, purpose and points."""
+   points = "".join(f"• {p}\n" for p in key_points) + "\n" if key_points else ""
+   return (
+      f"Dear {recipient},\n\nI hope this email finds you well.\n\n{purpose}\n\n"
+      f"{points}I look forward to hearing from you.\n\nBest regards"
+   )
 
 # Router Agent Prompt (LLM-based decision making)
 # Expects the model to output a STRICT JSON object with keys: decision, reason.
 # decision must be one of: continue, retry, fallback.
-ROUTER_AGENT_PROMPT = ChatPromptTemplate.from_template(
-   """
+_ROUTER_AGENT_TEMPLATE = """
 You are an expert workflow controller deciding the next action in an email generation pipeline.
 
 Context Summary:
@@ -397,7 +412,68 @@ Rules:
 4. Keep reasoning concise (<= 25 words).
 5. If unsure, choose deterministic safety: retry if retries remain else fallback.
 
-Return ONLY valid JSON: {"decision": "continue|retry|fallback", "reason": "short explanation"}
+Return ONLY valid JSON: {{"decision": "continue|retry|fallback", "reason": "short explanation"}}
 Do NOT wrap JSON in markdown fences. No additional text.
 """
-)
+
+
+# Lazily built ChatPromptTemplates, exposed as module attributes
+_CHAT_TEMPLATES = {
+   "INPUT_PARSER_PROMPT": _INPUT_PARSER_TEMPLATE,
+   "INTENT_DETECTOR_PROMPT": _INTENT_DETECTOR_TEMPLATE,
+   "TONE_STYLIST_PROMPT": _TONE_STYLIST_TEMPLATE,
+   "REVIEW_AGENT_PROMPT": _REVIEW_AGENT_TEMPLATE,
+   "PERSONALIZATION_PROMPT": _PERSONALIZATION_TEMPLATE,
+   "FUSED_STYLE_PROMPT": _FUSED_STYLE_TEMPLATE,
+   "REFINEMENT_AGENT_PROMPT": _REFINEMENT_AGENT_TEMPLATE,
+   "ROUTER_AGENT_PROMPT": _ROUTER_AGENT_TEMPLATE,
+}
+_chat_prompt_lock = threading.Lock()
+
+
+def _chat_prompt(name: str) -> "ChatPromptTemplate":
+   prompt = globals().get(name)
+   if prompt is None:
+      with _chat_prompt_lock:
+         prompt = globals().get(name)
+         if prompt is None:
+            from langchain.prompts import ChatPromptTemplate
+
+            # Cache as a real module global so later lookups skip __getattr__
+            prompt = globals()[name] = ChatPromptTemplate.from_template(_CHAT_TEMPLATES[name])
+   return prompt
+
+
+@lru_cache(maxsize=32)
+def _template_segments(name: str) -> tuple:
+   # (literal, interned field name or None) pairs, parsed once per template
+   segments = []
+   for literal, field, spec, conversion in string.Formatter().parse(_CHAT_TEMPLATES[name]):
+      if spec or conversion:
+         raise ValueError(f"{name}: format specs are not supported in prompt templates")
+      segments.append((literal, sys.intern(field) if field is not None else None))
+   return tuple(segments)
+
+
+def render_prompt(name: str, **values) -> str:
+   """Fill a *_PROMPT template by name and return the prompt text.
+
+   For call sites that send a single formatted message to the LLM; avoids
+   re-parsing the template on every call.
+   """
+   parts = []
+   for literal, field in _template_segments(name):
+      parts.append(literal)
+      if field is not None:
+         parts.append(str(values[field]))
+   return "".join(parts)
+
+
+def __getattr__(name: str):
+   if name in _CHAT_TEMPLATES:
+      return _chat_prompt(name)
+   raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+   return sorted(set(globals()) | set(_CHAT_TEMPLATES))
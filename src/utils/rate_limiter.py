@@ -13,19 +13,41 @@ Usage:
     from src.utils.rate_limiter import RateLimiter
     limiter = RateLimiter(rpm=30, tpm=60000, max_concurrency=4)
     limiter.acquire(estimated_input_tokens)
+    # or, from a coroutine: await limiter.acquire_async(estimated_input_tokens)
 
 The acquire() method will block until allowance is available or raise after an
 extended wait (currently it does not raise; it just waits).
 """
 from __future__ import annotations
 
+import asyncio
 import threading
 import time
 import random
+from array import array
+from bisect import bisect_left
 from collections import deque
-from typing import Deque
+from typing import Deque, Optional, Set, Tuple
 
 class RateLimiter:
+    __slots__ = (
+        "rpm",
+        "tpm",
+        "max_concurrency",
+        "jitter_ms",
+        "_cv",
+        "_req_timestamps",
+        "_token_ts",
+        "_token_cum",
+        "_token_head",
+        "_token_base",
+        "_token_sum",
+        "_in_flight",
+        "_jitter_table",
+        "_jitter_idx",
+        "_async_waiters",
+    )
+
     def __init__(
         self,
         rpm: int,
@@ -37,17 +59,93 @@ class RateLimiter:
         self.tpm = max(1, tpm)
         self.max_concurrency = max(1, max_concurrency)
         self.jitter_ms = max(0, jitter_ms)
-        self._lock = threading.Lock()
+        self._cv = threading.Condition()
         self._req_timestamps: Deque[float] = deque()
-        self._token_timestamps: Deque[tuple[float, int]] = deque()
+        # Token window as parallel arrays: entry timestamps and running
+        # (cumulative) token totals. Entries before _token_head have expired;
+        # _token_base is the cumulative total just before the head.
+        self._token_ts = array("d")
+        self._token_cum = array("q")
+        self._token_head = 0
+        self._token_base = 0
+        self._token_sum = 0  # tokens currently inside the window
         self._in_flight = 0
+        # Precomputed jitter, indexed under the lock; avoids hitting the
+        # shared random generator on every retry
+        jitter_s = self.jitter_ms / 1000.0
+        self._jitter_table = [random.uniform(0, jitter_s) for _ in range(1024)] if self.jitter_ms else [0.0]
+        self._jitter_idx = 0
+        # (loop, asyncio.Event) pairs for coroutines blocked in acquire_async
+        self._async_waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
 
     def _purge(self, now: float) -> None:
         one_minute_ago = now - 60.0
-        while self._req_timestamps and self._req_timestamps[0] < one_minute_ago:
-            self._req_timestamps.popleft()
-        while self._token_timestamps and self._token_timestamps[0][0] < one_minute_ago:
-            self._token_timestamps.popleft()
+        req = self._req_timestamps
+        ts = self._token_ts
+        head = self._token_head
+        # Fast path: nothing has aged out of either window
+        if (not req or req[0] >= one_minute_ago) and (head >= len(ts) or ts[head] >= one_minute_ago):
+            return
+        while req and req[0] < one_minute_ago:
+            req.popleft()
+        while head < len(ts) and ts[head] < one_minute_ago:
+            head += 1
+        if head != self._token_head:
+            self._token_base = self._token_cum[head - 1]
+            self._token_sum = (self._token_cum[-1] if self._token_cum else self._token_base) - self._token_base
+            # Compact occasionally so expired entries don't accumulate
+            if head >= 256 and head * 2 >= len(ts):
+                del ts[:head]
+                del self._token_cum[:head]
+                head = 0
+            self._token_head = head
+
+    def _try_acquire(self, est_tokens: int) -> Tuple[bool, Optional[float]]:
+        """Take a slot if permitted. Caller must hold ``self._cv``.
+
+        Returns (True, None) when the slot was taken, otherwise (False, wait)
+        where wait is the suggested delay in seconds, or None to wait for a
+        release() notification.
+        """
+        now = time.monotonic()
+        self._purge(now)
+        # Check concurrency
+        if self._in_flight >= self.max_concurrency:
+            # No timeout: release() notifies when a slot frees
+            return False, None
+        # RPM check
+        if len(self._req_timestamps) >= self.rpm:
+            # Wait until earliest request exits window
+            earliest = self._req_timestamps[0]
+            return False, max(0.01, (earliest + 60.0) - now)
+        # TPM check. Admissions keep the window total <= tpm, so a zero-token
+        # request (e.g. the context-manager path) can never be blocked here.
+        if est_tokens:
+            token_used_last_min = self._token_sum
+            if token_used_last_min + est_tokens > self.tpm:
+                # Wait until some tokens fall out of window:
+                # find the earliest entry whose expiry frees enough
+                needed = token_used_last_min + est_tokens - self.tpm
+                idx = bisect_left(
+                    self._token_cum, self._token_base + needed, self._token_head
+                )
+                if idx >= len(self._token_ts):
+                    # Fallback small wait
+                    return False, 0.25
+                return False, max(0.01, self._token_ts[idx] + 60.0 - now)
+            last = self._token_cum[-1] if self._token_cum else self._token_base
+            self._token_ts.append(now)
+            self._token_cum.append(last + est_tokens)
+            self._token_sum += est_tokens
+        # Allowed
+        self._req_timestamps.append(now)
+        self._in_flight += 1
+        return True, None
+
+    def _next_jitter(self) -> float:
+        jitter = self._jitter_table[self._jitter_idx % len(self._jitter_table)]
+        self._jitter_idx += 1
+        return jitter
 
     def acquire(self, estimated_input_tokens: int) -> None:
         """Block until request is permitted under RPM/TPM/concurrency.
@@ -55,54 +153,58 @@ class RateLimiter:
         estimated_input_tokens: rough estimate provided by caller.
         """
         est_tokens = max(0, estimated_input_tokens)
-        while True:
-            with self._lock:
-                now = time.time()
-                self._purge(now)
-                # Check concurrency
-                if self._in_flight >= self.max_concurrency:
-                    wait = 0.05
+        with self._cv:
+            while True:
+                acquired, wait = self._try_acquire(est_tokens)
+                if acquired:
+                    return
+                # Wait releases the lock; release() wakes us early when a
+                # concurrency slot frees, otherwise the timeout covers the
+                # RPM/TPM window expiry. Jitter spreads out herd wakeups.
+                if wait is None:
+                    self._cv.wait()
                 else:
-                    # RPM check
-                    if len(self._req_timestamps) >= self.rpm:
-                        # Wait until earliest request exits window
-                        earliest = self._req_timestamps[0]
-                        wait = max(0.01, (earliest + 60.0) - now)
-                    else:
-                        # TPM check
-                        token_used_last_min = sum(t for _, t in self._token_timestamps)
-                        if token_used_last_min + est_tokens > self.tpm:
-                            # Wait until some tokens fall out of window
-                            # Approx: find earliest that frees enough tokens
-                            cumulative = 0
-                            wait_until = None
-                            for ts, tok in self._token_timestamps:
-                                cumulative += tok
-                                if token_used_last_min - cumulative + est_tokens <= self.tpm:
-                                    wait_until = ts + 60.0
-                                    break
-                            if wait_until is None:
-                                # Fallback small wait
-                                wait = 0.25
-                            else:
-                                wait = max(0.01, wait_until - now)
-                        else:
-                            # Allowed
-                            self._req_timestamps.append(now)
-                            if est_tokens:
-                                self._token_timestamps.append((now, est_tokens))
-                            self._in_flight += 1
-                            # Release lock and return
-                            break
-            # Sleep outside lock
-            # Add jitter
-            jitter = random.uniform(0, self.jitter_ms / 1000.0) if self.jitter_ms else 0.0
-            time.sleep(wait + jitter)
+                    self._cv.wait(timeout=wait + self._next_jitter())
+
+    async def acquire_async(self, estimated_input_tokens: int) -> None:
+        """Async variant of acquire() that waits without blocking the event loop.
+
+        Shares state with the sync path, so sync and async callers can use the
+        same limiter; release() from either side wakes both.
+        """
+        est_tokens = max(0, estimated_input_tokens)
+        loop = asyncio.get_running_loop()
+        while True:
+            # The lock is only held for the admission check, never across an await
+            with self._cv:
+                acquired, wait = self._try_acquire(est_tokens)
+                if acquired:
+                    return
+                waiter = (loop, asyncio.Event())
+                self._async_waiters.add(waiter)
+                timeout = None if wait is None else wait + self._next_jitter()
+            try:
+                await asyncio.wait_for(waiter[1].wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                with self._cv:
+                    self._async_waiters.discard(waiter)
 
     def release(self) -> None:
-        with self._lock:
+        with self._cv:
             if self._in_flight > 0:
                 self._in_flight -= 1
+            self._cv.notify_all()
+            # Wake coroutines waiting in acquire_async on their own loops
+            for loop, event in self._async_waiters:
+                try:
+                    loop.call_soon_threadsafe(event.set)
+                except RuntimeError:  # loop already closed
+                    pass
+
+    async def release_async(self) -> None:
+        self.release()
 
     def __enter__(self):  # context manager for manual usage if desired
         self.acquire(0)
@@ -111,4 +213,11 @@ class RateLimiter:
     def __exit__(self, exc_type, exc, tb):
         self.release()
 
+    async def __aenter__(self):
+        await self.acquire_async(0)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release_async()
+
 __all__ = ["RateLimiter"]
@@ -0,0 +1,215 @@
+"""Embedding-based response cache for near-duplicate LLM requests.
+
+Requests such as "write a follow-up to John about the proposal" and "follow up
+with John re: proposal" usually produce the same intent classification. The
+SemanticCache returns a stored response when a new request's embedding has
+cosine similarity above ``threshold`` with a cached one, skipping the LLM call.
+
+Entries expire after ``ttl`` seconds and the cache is bounded LRU-style. An
+exact match on the normalized key is always checked first and needs no
+embedding; a threshold of 1.0 or more disables the similarity search entirely.
+
+numpy is used for the similarity scan when installed; otherwise a pure-Python
+dot product is used.
+
+Usage:
+    from src.utils.semantic_cache import get_semantic_cache
+    cache = get_semantic_cache("intent_detector")
+    hit, vec = cache.get(key, return_vec=True)
+    if hit is None:
+        hit = call_llm()
+        cache.put(key, hit, vec=vec)  # reuses the query embedding
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .config import settings
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_key(text: str) -> str:
+    return " ".join(str(text).lower().split())
+
+
+def _unit(vec: Sequence[float]) -> Optional[List[float]]:
+    norm = math.sqrt(sum(x * x for x in vec))
+    if not norm:
+        return None
+    return [x / norm for x in vec]
+
+
+class SemanticCache:
+    def __init__(
+        self,
+        embed_fn: Optional[Callable[[List[str]], List[List[float]]]],
+        threshold: float = 0.92,
+        ttl: int = 3600,
+        max_entries: int = 1000,
+    ) -> None:
+        """Create a cache.
+
+        Args:
+            embed_fn: Chroma-style embedding function (list of texts -> list of
+                vectors). May be None for exact-match-only caching.
+            threshold: Minimum cosine similarity for a semantic hit.
+            ttl: Seconds before an entry expires.
+            max_entries: Oldest entries are evicted beyond this size.
+        """
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        # key -> (unit embedding or None, value, expires_at); embeddings are
+        # float32 arrays when numpy is installed
+        self._entries: "OrderedDict[str, tuple[Optional[Sequence[float]], Any, float]]" = OrderedDict()
+
+    @property
+    def _semantic(self) -> bool:
+        return self.embed_fn is not None and self.threshold < 1.0
+
+    def _embed(self, key: str) -> Optional[Sequence[float]]:
+        try:
+            vec = self.embed_fn([key])[0]  # type: ignore[misc]
+            # Failed model calls come back as one-element placeholder vectors
+            if vec is None or len(vec) < 2:
+                return None
+            if np is not None:
+                arr = np.asarray(vec, dtype=np.float32)
+                norm = float(np.linalg.norm(arr))
+                return arr / norm if norm else None
+            return _unit([float(x) for x in vec])
+        except Exception:
+            logger.debug("Semantic cache embedding failed", exc_info=True)
+            return None
+
+    def _purge(self, now: float) -> None:
+        expired = [k for k, (_, _, exp) in self._entries.items() if exp <= now]
+        for k in expired:
+            del self._entries[k]
+
+    def get(self, text: str, return_vec: bool = False) -> Any:
+        """Return the cached value for ``text`` or a close neighbour, else None.
+
+        With ``return_vec`` the result is ``(value, query_embedding)``; pass the
+        embedding to ``put`` on a miss so the key is not embedded twice. It is
+        None when no embedding was computed.
+        """
+        value, query = self._lookup(text)
+        return (value, query) if return_vec else value
+
+    def _lookup(self, text: str) -> "tuple[Optional[Any], Optional[Sequence[float]]]":
+        key = _normalize_key(text)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] > now:
+                self._entries.move_to_end(key)
+                return entry[1], None
+            if not self._semantic or not self._entries:
+                return None, None
+
+        query = self._embed(key)
+        if query is None:
+            return None, None
+
+        with self._lock:
+            self._purge(now)
+            candidates = [
+                (k, vec) for k, (vec, _, _) in self._entries.items()
+                if vec is not None and len(vec) == len(query)
+            ]
+            if not candidates:
+                return None, query
+            if np is not None:
+                matrix = np.stack([vec for _, vec in candidates])
+                scores = matrix @ query
+                best = int(scores.argmax())
+                best_score = float(scores[best])
+            else:
+                scores = [sum(a * b for a, b in zip(vec, query)) for _, vec in candidates]
+                best = max(range(len(scores)), key=scores.__getitem__)
+                best_score = scores[best]
+            if best_score < self.threshold:
+                return None, query
+            best_key = candidates[best][0]
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key][1], query
+
+    def put(self, text: str, value: Any, vec: Optional[Sequence[float]] = None) -> None:
+        """Cache ``value`` for ``text``; ``vec`` is its embedding from ``get`` if known."""
+        key = _normalize_key(text)
+        if vec is None and self._semantic:
+            vec = self._embed(key)
+        elif not self._semantic:
+            vec = None
+        with self._lock:
+            self._entries[key] = (vec, value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_caches: Dict[str, SemanticCache] = {}
+_caches_lock = threading.Lock()
+_embed_fn: Optional[Callable[[List[str]], List[List[float]]]] = None
+
+
+def _default_embed_fn() -> Optional[Callable[[List[str]], List[List[float]]]]:
+    """Return a model-backed embedding function, or None for exact matches only.
+
+    Hashed bag-of-words vectors are not used: requests sharing most of their
+    words score above the threshold even when they ask for different things
+    ("thank him for the numbers" vs "apologize to him for the numbers").
+    """
+    global _embed_fn
+    if _embed_fn is None:
+        try:
+            from .vector_store import GeminiEmbeddingFunction
+
+            fn = GeminiEmbeddingFunction(hashed_fallback=False)
+        except Exception:
+            fn = None
+        if fn is None or not fn.has_model:
+            logger.warning("Semantic cache embeddings unavailable; using exact matches only")
+            return None
+        _embed_fn = fn
+    return _embed_fn
+
+
+def get_semantic_cache(namespace: str, threshold: Optional[float] = None) -> SemanticCache:
+    """Return the process-wide cache for ``namespace`` (created on first use)."""
+    cache = _caches.get(namespace)
+    if cache is not None:
+        return cache
+    with _caches_lock:
+        cache = _caches.get(namespace)
+        if cache is None:
+            thr = settings.semantic_cache_threshold if threshold is None else threshold
+            cache = SemanticCache(
+                _default_embed_fn() if thr < 1.0 else None,
+                threshold=thr,
+                ttl=settings.semantic_cache_ttl,
+                max_entries=settings.semantic_cache_max_entries,
+            )
+            _caches[namespace] = cache
+    return cache
+
+
+__all__ = ["SemanticCache", "get_semantic_cache"]
@@ -4,10 +4,16 @@ Provides async indexing on draft saves and top-k retrieval per user.
 """
 from __future__ import annotations
 
+import atexit
+import math
 import os
+import re
 import threading
 import logging
-from typing import Any, Dict, List, Optional
+import zlib
+from itertools import islice, zip_longest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from src.utils.config import settings
 
@@ -18,29 +24,89 @@ except Exception as e:  # pragma: no cover - optional import safety
     chromadb = None  # type: ignore
     embedding_functions = None  # type: ignore
 
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+
 logger = logging.getLogger(__name__)
 
+# Fill value for query results whose metadata/distance lists run short
+_MISSING = object()
+
+# Last-resort local embedding: signed feature hashing of word tokens
+_HASH_DIM = 256
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _hashed_embedding(text: str) -> List[float]:
+    """Deterministic bag-of-words vector via the hashing trick (L2-normalized).
+
+    Uses crc32 rather than hash(), which is salted per process and would give
+    different vectors after a restart.
+    """
+    vec = [0.0] * _HASH_DIM
+    for token in _TOKEN_RE.findall(text.lower()):
+        h = zlib.crc32(token.encode("utf-8"))
+        vec[h % _HASH_DIM] += 1.0 if (h >> 31) & 1 else -1.0
+    norm = math.sqrt(sum(x * x for x in vec))
+    return [x / norm for x in vec] if norm else vec
+
+
+_genai_mod = None
+_genai_lock = threading.Lock()
+
+
+def _get_genai():
+    """Import and configure google.generativeai once per process.
+
+    Raises when the package is missing or Gemini is disabled by settings.
+    """
+    global _genai_mod
+    if _genai_mod is None:
+        with _genai_lock:
+            if _genai_mod is None:
+                # Lazy import to avoid hard dependency if not used
+                import google.generativeai as genai  # type: ignore
+
+                if not settings.gemini_api_key or settings.donotusegemini:
+                    raise RuntimeError("Gemini API key missing or disabled by settings")
+                genai.configure(api_key=settings.gemini_api_key)
+                _genai_mod = genai
+    return _genai_mod
+
+
+def _pack_embeddings(vecs: Sequence[Sequence[float]]) -> List[Sequence[float]]:
+    """Store embeddings as rows of one float32 matrix when numpy is available.
+
+    A Python list of 768 boxed floats costs ~21KB per vector; a float32 row is
+    3KB. Rows of unequal length (failed-embedding placeholders) are packed
+    individually.
+    """
+    if np is None:
+        return [list(v) for v in vecs]
+    try:
+        return list(np.asarray(vecs, dtype=np.float32))
+    except ValueError:
+        return [np.asarray(v, dtype=np.float32) for v in vecs]
+
 
 class GeminiEmbeddingFunction:
     """Embedding function using Google Generative AI embeddings.
 
     Falls back to Chroma's DefaultEmbeddingFunction if Gemini is unavailable
-    or disabled via settings.
+    or disabled via settings, and to hashed bag-of-words vectors if that is
+    unavailable too. Pass ``hashed_fallback=False`` to get one-element
+    placeholder vectors instead of hashed ones (see ``has_model``).
     """
 
-    def __init__(self, model: str = "models/text-embedding-004") -> None:
+    def __init__(self, model: str = "models/text-embedding-004", hashed_fallback: bool = True) -> None:
         self.model = model
+        self.hashed_fallback = hashed_fallback
         self._fallback = None
 
-        # Lazy import to avoid hard dependency if not used
         try:
-            import google.generativeai as genai  # type: ignore
-
-            if settings.gemini_api_key and not settings.donotusegemini:
-                genai.configure(api_key=settings.gemini_api_key)
-                self._genai = genai
-            else:
-                raise RuntimeError("Gemini API key missing or disabled by settings")
+            self._genai = _get_genai()
         except Exception as e:  # pragma: no cover - environment dependent
             logger.warning(
                 f"Gemini embeddings not available ({e}); using default embedding function if possible"
@@ -53,24 +119,25 @@ class GeminiEmbeddingFunction:
                 except Exception:
                     self._fallback = None
 
-    def __call__(self, texts: List[str]) -> List[List[float]]:  # type: ignore[override]
+    def __call__(self, texts: List[str]) -> List[Sequence[float]]:  # type: ignore[override]
         if not isinstance(texts, list):
             texts = [texts]
 
         # Prefer Gemini embeddings if configured
         if getattr(self, "_genai", None):
-            out: List[List[float]] = []
-            for t in texts:
+            # One batched request for the whole list; embed_content accepts a list
+            if len(texts) > 1:
                 try:
-                    resp = self._genai.embed_content(model=self.model, content=t, task_type="retrieval_document")
-                    vec = resp["embedding"] if isinstance(resp, dict) else getattr(resp, "embedding", None)
-                    if not vec:
-                        raise RuntimeError("Empty embedding from Gemini")
-                    out.append(vec)
+                    resp = self._genai.embed_content(model=self.model, content=texts, task_type="retrieval_document")
+                    vecs = resp["embedding"] if isinstance(resp, dict) else getattr(resp, "embedding", None)
+                    if vecs and len(vecs) == len(texts) and all(len(v) for v in vecs):
+                        return _pack_embeddings(vecs)
+                    raise RuntimeError("Unexpected batch embedding shape from Gemini")
                 except Exception as e:  # pragma: no cover - network dependent
-                    logger.debug(f"Gemini embedding failed for text length {len(t)}: {e}")
-                    out.append([0.0])  # keep shape; will be ignored by ANN
-            return out
+                    logger.debug(f"Gemini batch embedding failed for {len(texts)} texts; embedding individually: {e}")
+            if len(texts) == 1:
+                return _pack_embeddings([self._embed_one(texts[0])])
+            return _pack_embeddings(self._embed_concurrently(texts))
 
         # Fallback embedding if available
         if self._fallback is not None:
@@ -79,8 +146,37 @@ class GeminiEmbeddingFunction:
             except Exception as e:  # pragma: no cover
                 logger.debug(f"Default embedding failed: {e}")
 
-        # Last-resort deterministic pseudo-vector (very weak; avoids crashes)
-        return [[float((hash(t) % 1000) / 1000.0)] for t in texts]
+        if not self.hashed_fallback:
+            return _pack_embeddings([[0.0] for _ in texts])
+        # Last-resort local embedding (no network); similar texts stay close
+        return _pack_embeddings([_hashed_embedding(t) for t in texts])
+
+    @property
+    def has_model(self) -> bool:
+        """True when a real embedding model (Gemini or Chroma's default) is set up."""
+        return bool(getattr(self, "_genai", None)) or self._fallback is not None
+
+    def _embed_concurrently(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts one request each, with up to chroma_embed_concurrency in flight.
+
+        Uses the SDK's sync client on a thread pool: its async (grpc.aio)
+        client is cached per process and bound to the first event loop it
+        ran on, so it cannot be driven from a fresh loop per call.
+        """
+        limit = max(1, settings.chroma_embed_concurrency)
+        with ThreadPoolExecutor(max_workers=min(limit, len(texts))) as pool:
+            return list(pool.map(self._embed_one, texts))
+
+    def _embed_one(self, text: str) -> List[float]:
+        try:
+            resp = self._genai.embed_content(model=self.model, content=text, task_type="retrieval_document")
+            vec = resp["embedding"] if isinstance(resp, dict) else getattr(resp, "embedding", None)
+            if not vec:
+                raise RuntimeError("Empty embedding from Gemini")
+            return vec
+        except Exception as e:  # pragma: no cover - network dependent
+            logger.debug(f"Gemini embedding failed for text length {len(text)}: {e}")
+            return [0.0]  # keep shape; will be ignored by ANN
 
 
 class ChromaVectorStore:
@@ -141,6 +237,42 @@ class ChromaVectorStore:
         except Exception as e:  # pragma: no cover - depends on environment
             logger.warning(f"Chroma upsert failed for user={user_id}, id={draft_id}: {e}")
 
+    def upsert_drafts(
+        self,
+        items: List[Tuple[str, str, str, Optional[Dict[str, Any]]]],
+    ) -> None:
+        """Upsert several (user_id, draft_id, content, metadata) drafts in one call.
+
+        Lets Chroma embed the batch in one request and amortize index inserts.
+        Later entries for the same draft replace earlier ones.
+        """
+        if not settings.enable_chromadb:
+            return
+        batch: Dict[str, Tuple[str, str, str, Optional[Dict[str, Any]]]] = {}
+        for user_id, draft_id, content, metadata in items:
+            if not content or not user_id or not draft_id:
+                continue
+            # Duplicate ids in one upsert are rejected by Chroma; keep the latest
+            batch[f"{user_id}:{draft_id}"] = (user_id, draft_id, content, metadata)
+        if not batch:
+            return
+        try:
+            self.collection.upsert(
+                ids=list(batch),
+                documents=[content for _, _, content, _ in batch.values()],
+                metadatas=[
+                    {"user_id": user_id, **(metadata or {})}
+                    for user_id, _, _, metadata in batch.values()
+                ],
+            )
+            logger.debug(f"Upserted {len(batch)} drafts into Chroma")
+        except Exception as e:  # pragma: no cover - depends on environment
+            # Chroma rejects the whole call for one bad row (e.g. a failed
+            # embedding); retry one by one so only that draft is lost
+            logger.warning(f"Chroma batch upsert failed for {len(batch)} drafts, retrying individually: {e}")
+            for item in batch.values():
+                self.upsert_draft(*item)
+
     def query_similar(
         self,
         user_id: str,
@@ -158,19 +290,24 @@ class ChromaVectorStore:
                 n_results=max(1, min(k, 10)),
             )
             # Normalize output
-            docs = results.get("documents", [[]])[0] if isinstance(results, dict) else []
-            metas = results.get("metadatas", [[]])[0] if isinstance(results, dict) else []
-            dists = results.get("distances", [[]])[0] if isinstance(results, dict) else []
-            items: List[Dict[str, Any]] = []
-            for i, doc in enumerate(docs):
-                items.append(
-                    {
-                        "content": doc,
-                        "metadata": metas[i] if i < len(metas) else {},
-                        "distance": dists[i] if i < len(dists) else None,
-                    }
-                )
-            return items
+            if not isinstance(results, dict):
+                return []
+            docs = (results.get("documents") or [[]])[0] or []
+            metas = (results.get("metadatas") or [[]])[0] or []
+            dists = (results.get("distances") or [[]])[0] or []
+            # Metadata / distances may be omitted or shorter than documents
+            if len(metas) == len(docs) and len(dists) == len(docs):
+                rows = zip(docs, metas, dists)
+            else:
+                rows = islice(zip_longest(docs, metas, dists, fillvalue=_MISSING), len(docs))
+            return [
+                {
+                    "content": doc,
+                    "metadata": {} if meta is _MISSING else meta,
+                    "distance": None if dist is _MISSING else dist,
+                }
+                for doc, meta, dist in rows
+            ]
         except Exception as e:  # pragma: no cover
             logger.warning(f"Chroma query failed for user={user_id}: {e}")
             return []
@@ -178,6 +315,21 @@ class ChromaVectorStore:
 
 _store: Optional[ChromaVectorStore] = None
 _index_executor_lock = threading.Lock()
+_index_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_index_executor() -> ThreadPoolExecutor:
+    """Bounded worker pool for background indexing (created on first use)."""
+    global _index_executor
+    if _index_executor is None:
+        with _index_executor_lock:
+            if _index_executor is None:
+                _index_executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.chroma_index_workers or 4),
+                    thread_name_prefix="chroma-index",
+                )
+                atexit.register(_index_executor.shutdown, wait=False)
+    return _index_executor
 
 
 def get_vector_store() -> Optional[ChromaVectorStore]:
@@ -193,8 +345,47 @@ def get_vector_store() -> Optional[ChromaVectorStore]:
     return _store
 
 
+_pending_lock = threading.Lock()
+_pending: List[Tuple[str, str, str, Optional[Dict[str, Any]]]] = []
+_flush_timer: Optional[threading.Timer] = None
+
+
+def _flush_pending() -> None:
+    """Upsert every queued draft in batches (runs on the index pool)."""
+    global _flush_timer
+    with _pending_lock:
+        batch = _pending[:]
+        _pending.clear()
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+    if not batch:
+        return
+    store = get_vector_store()
+    if store is None:
+        return
+    size = max(1, settings.chroma_flush_batch_size)
+    for start in range(0, len(batch), size):
+        try:
+            store.upsert_drafts(batch[start:start + size])
+        except Exception as e:  # pragma: no cover
+            logger.debug(f"Background indexing failed for {len(batch[start:start + size])} drafts: {e}")
+
+
+def _submit_flush() -> None:
+    try:
+        _get_index_executor().submit(_flush_pending)
+    except RuntimeError:  # executor shut down at interpreter exit
+        _flush_pending()
+
+
 def index_draft_async(user_id: str, draft_id: str, content: str, metadata: Optional[Dict[str, Any]] = None) -> None:
-    """Index a draft in the background to avoid blocking request handlers."""
+    """Index a draft in the background to avoid blocking request handlers.
+
+    Drafts are queued and upserted in micro-batches: as soon as
+    chroma_flush_batch_size are waiting, or after chroma_flush_interval_ms.
+    """
+    global _flush_timer
     if not settings.enable_chromadb:
         return
 
@@ -202,13 +393,19 @@ def index_draft_async(user_id: str, draft_id: str, content: str, metadata: Optio
     if store is None:
         return
 
-    def _task():
-        try:
-            store.upsert_draft(user_id=user_id, draft_id=draft_id, content=content, metadata=metadata)
-        except Exception as e:  # pragma: no cover
-            logger.debug(f"Background indexing failed for user={user_id}, id={draft_id}: {e}")
+    with _pending_lock:
+        _pending.append((user_id, draft_id, content, metadata))
+        if len(_pending) >= settings.chroma_flush_batch_size:
+            flush_now = True
+        else:
+            flush_now = False
+            if _flush_timer is None:
+                _flush_timer = threading.Timer(settings.chroma_flush_interval_ms / 1000.0, _submit_flush)
+                _flush_timer.daemon = True
+                _flush_timer.start()
+    if flush_now:
+        _submit_flush()
+
 
-    # Fire-and-forget thread
-    t = threading.Thread(target=_task, name=f"chroma-index-{user_id}-{draft_id}")
-    t.daemon = True
-    t.start()
+# Don't drop drafts still waiting for the timer at shutdown
+atexit.register(_flush_pending)
@@ -1,6 +1,10 @@
-from typing import TypedDict, Any, Dict, Callable, Optional
+from typing import TypedDict, Any, Dict, Callable, Optional, Sequence
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import os
+import re
 import sys
+import threading
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 
@@ -25,38 +29,65 @@ class EmailState(TypedDict, total=False):
     intent: str
     draft: str
     tone: str
+    user_profile: Dict[str, Any]
     personalized_draft: str
     review_notes: Dict[str, Any]
     next_step: str
 
 
-def _init_llm() -> ChatGoogleGenerativeAI:
+def _init_llm(tier: str = "smart") -> ChatGoogleGenerativeAI:
     """Initialize the LLM using settings from config.
     
+    ``tier="cheap"`` selects ``settings.gemini_fast_model`` when configured,
+    for stages that only pick a label from a closed list.
+
     NOTE: This should only be called when we're actually going to use the LLM,
     as instantiation may trigger validation calls to the Gemini API.
     """
     # Activate tracing once if configured
     activate_langsmith()
+    model = settings.gemini_model
+    if tier == "cheap" and settings.gemini_fast_model:
+        model = settings.gemini_fast_model
+    extra: Dict[str, Any] = {}
+    # A CachedContent belongs to one model, so only attach it to that model
+    if settings.gemini_cached_content and model == settings.gemini_model:
+        extra["cached_content"] = settings.gemini_cached_content
     return ChatGoogleGenerativeAI(
-        model=settings.gemini_model,
+        model=model,
         google_api_key=settings.gemini_api_key,
         temperature=settings.temperature,
         max_output_tokens=settings.max_tokens,
+        **extra,
     )
 
 
-def create_agents(llm: ChatGoogleGenerativeAI) -> Dict[str, Callable[[Dict], Dict]]:
-    """Create and return instantiated agent callables keyed by name."""
+def create_agents(
+    llm: ChatGoogleGenerativeAI,
+    fast_llm: Optional[ChatGoogleGenerativeAI] = None,
+) -> Dict[str, Callable[[Dict], Dict]]:
+    """Create and return instantiated agent callables keyed by name.
+
+    ``fast_llm`` (optional) serves the classification stages — intent
+    detection and routing — with its own wrapper and rate limits.
+    """
     wrapper: LLMWrapper = make_wrapper(llm)
+    if fast_llm is None:
+        fast_llm, fast_wrapper = llm, wrapper
+    else:
+        fast_wrapper = make_wrapper(
+            fast_llm,
+            requests_per_minute=settings.fast_model_requests_per_minute,
+            tokens_per_minute=settings.fast_model_tokens_per_minute,
+        )
 
     input_parser = InputParserAgent(llm, llm_wrapper=wrapper)
-    intent_detector = IntentDetectorAgent(llm, llm_wrapper=wrapper)
+    intent_detector = IntentDetectorAgent(fast_llm, llm_wrapper=fast_wrapper)
     draft_writer = DraftWriterAgent(llm, llm_wrapper=wrapper)
     tone_stylist = ToneStylistAgent(llm, llm_wrapper=wrapper)
     personalization = PersonalizationAgent(llm, llm_wrapper=wrapper)
     review = ReviewAgent(llm, llm_wrapper=wrapper)
-    router = RouterAgent(llm)
+    router = RouterAgent(fast_llm)
 
     return {
         "input_parser": input_parser,
@@ -64,22 +95,134 @@ def create_agents(llm: ChatGoogleGenerativeAI) -> Dict[str, Callable[[Dict], Dic
         "draft_writer": draft_writer,
         "tone_stylist": tone_stylist,
         "personalization": personalization,
+        "profile_loader": personalization.prefetch_profile,
         "review": review,
         "router": router,
     }
 
 
+_runtime_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_agents() -> Dict[str, Callable[[Dict], Dict]]:
+    """Build the default LLM clients and agents once per process.
+
+    Agents keep no per-request state (everything request-specific is read
+    from the workflow state, and user profiles are re-read when their file
+    changes), so one set can serve every execution. Call
+    ``_cached_agents.cache_clear()`` and ``_cached_pipeline.cache_clear()``
+    after changing model settings.
+    """
+    llm = _init_llm()
+    fast_llm = _init_llm("cheap") if settings.gemini_fast_model else None
+    return create_agents(llm, fast_llm)
+
+
+_DEFAULT_ORDER: tuple[str, ...] = (
+    "input_parser",
+    "profile_loader",
+    "intent_detector",
+    "draft_writer",
+    "tone_stylist",
+    "personalization",
+    "review",
+    "router",
+)
+
+
 def default_graph_order() -> list[str]:
     """Return a default ordered list of agent node names for the workflow."""
-    return [
-        "input_parser",
-        "intent_detector",
-        "draft_writer",
-        "tone_stylist",
-        "personalization",
-        "review",
-        "router",
-    ]
+    return list(_DEFAULT_ORDER)
+
+
+# State each node reads that another node produces. Nodes whose dependencies
+# are all satisfied run together.
+GRAPH_DEPENDENCIES: Dict[str, tuple[str, ...]] = {
+    "input_parser": (),
+    "profile_loader": (),
+    "intent_detector": ("input_parser",),
+    "draft_writer": ("input_parser", "intent_detector"),
+    "tone_stylist": ("draft_writer",),
+    "personalization": ("tone_stylist", "profile_loader"),
+    "review": ("personalization",),
+    "router": ("review",),
+}
+
+
+def _graph_levels(order: Sequence[str]) -> list[list[str]]:
+    """Group nodes into levels whose members only depend on earlier levels.
+
+    A dependency missing from ``order`` is replaced by its own dependencies,
+    and a node not listed in GRAPH_DEPENDENCIES waits for every node before
+    it. Nodes within a level keep their relative position from ``order``.
+    """
+    present = set(order)
+
+    def resolve(node: str) -> set[str]:
+        deps: set[str] = set()
+        for d in GRAPH_DEPENDENCIES.get(node, ()):
+            deps |= {d} if d in present else resolve(d)
+        return deps
+
+    deps_of = {
+        n: resolve(n) if n in GRAPH_DEPENDENCIES else set(order[:i])
+        for i, n in enumerate(order)
+    }
+    done: set[str] = set()
+    levels: list[list[str]] = []
+    for node in order:
+        # Levels are built in order, so a node can join the last level only if
+        # none of its dependencies are in it
+        if levels and not deps_of[node] & set(levels[-1]) and deps_of[node] <= done | set(levels[-1]):
+            levels[-1].append(node)
+        else:
+            done.update(levels[-1] if levels else ())
+            levels.append([node])
+    return levels
+
+
+Pipeline = tuple[tuple[tuple[str, Callable[[Dict], Dict]], ...], ...]
+
+
+def _build_pipeline(agents: Dict[str, Callable[[Dict], Dict]], order: Sequence[str]) -> Pipeline:
+    """Resolve ``order`` into dependency levels of (name, agent) pairs."""
+    for node_name in order:
+        if node_name not in agents:
+            print(f"[Workflow] Warning: Agent '{node_name}' not found, skipping")
+    levels = _graph_levels([n for n in order if n in agents])
+    return tuple(tuple((n, agents[n]) for n in level) for level in levels)
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_pipeline() -> Pipeline:
+    return _build_pipeline(_cached_agents(), _DEFAULT_ORDER)
+
+
+def _default_pipeline() -> Pipeline:
+    # lru_cache alone may run the constructors twice under a first-call race
+    with _runtime_lock:
+        return _cached_pipeline()
+
+
+_node_executor: Optional[ThreadPoolExecutor] = None
+_node_executor_lock = threading.Lock()
+
+
+def _get_node_executor() -> ThreadPoolExecutor:
+    global _node_executor
+    if _node_executor is None:
+        with _node_executor_lock:
+            if _node_executor is None:
+                _node_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="workflow-node")
+    return _node_executor
+
+
+def _run_node(agent: Callable[[Dict], Dict], state: EmailState) -> tuple[Dict, Optional[Exception]]:
+    try:
+        return agent(state) or {}, None
+    except Exception as e:  # noqa: BLE001 - reported per node by the caller
+        return {}, e
 
 
 def _detect_no_gemini_flag() -> bool:
@@ -100,6 +243,19 @@ def _detect_no_gemini_flag() -> bool:
     return False
 
 
+# Keyword -> (priority, intent); lower priority wins when several keywords occur
+_STUB_INTENT_KEYWORDS: Dict[str, tuple[int, str]] = {
+    "follow": (0, "follow_up"),
+    "thank": (1, "thank_you"),
+    "meeting": (2, "meeting_request"),
+    "schedule": (2, "meeting_request"),
+    "apolog": (3, "apology"),
+    "update": (4, "status_update"),
+    "status": (4, "status_update"),
+}
+_STUB_INTENT_RE = re.compile("|".join(_STUB_INTENT_KEYWORDS))
+
+
 def _generate_stub_state(user_input: str, tone: str = "formal") -> EmailState:
     """Create a lightweight stubbed state (no LLM calls) for local testing.
 
@@ -116,20 +272,16 @@ def _generate_stub_state(user_input: str, tone: str = "formal") -> EmailState:
         if ln.lower().startswith("recipient:"):
             recipient = ln.split(":", 1)[1].strip()
 
-    # Simple intent heuristics
+    # Simple intent heuristics: one regex pass, highest-priority keyword wins
     text = user_input.lower()
-    if "follow" in text or "follow-up" in text:
-        intent = "follow_up"
-    elif "thank" in text:
-        intent = "thank_you"
-    elif "meeting" in text or "schedule" in text:
-        intent = "meeting_request"
-    elif "apolog" in text:
-        intent = "apology"
-    elif "update" in text or "status" in text:
-        intent = "status_update"
-    else:
-        intent = "outreach"
+    intent = "outreach"
+    best = len(_STUB_INTENT_KEYWORDS)
+    for m in _STUB_INTENT_RE.finditer(text):
+        rank, label = _STUB_INTENT_KEYWORDS[m.group(0)]
+        if rank < best:
+            best, intent = rank, label
+            if rank == 0:
+                break
 
     # Key points: take first 2 short lines or first sentence fragments
     key_points = []
@@ -190,7 +342,10 @@ def execute_workflow(
     developer_mode: bool = False,
     length_preference: Optional[int] = None,
 ) -> EmailState:
-    """Execute the email workflow sequentially and return the final state.
+    """Execute the email workflow and return the final state.
+
+    Nodes run in dependency order (see GRAPH_DEPENDENCIES); nodes with no
+    pending dependencies run concurrently.
 
     If `use_stub` is True, the function will generate a stubbed state without calling the LLMs.
     If `use_stub` is None, it will auto-detect via environment variables or command-line flag.
@@ -213,12 +368,12 @@ def execute_workflow(
             _apply_length_constraint(stub, length_preference)
         return stub
 
-    # Only create LLM if we're NOT using stub mode
+    # Only create LLM if we're NOT using stub mode; the default clients and
+    # agents are built once and reused across executions
     if llm is None:
-        llm = _init_llm()
-
-    agents = create_agents(llm)
-    order = default_graph_order()
+        pipeline = _default_pipeline()
+    else:
+        pipeline = _build_pipeline(create_agents(llm), _DEFAULT_ORDER)
 
     # Initialize state with user_id, tone, and length preference (effective)
     effective_length = None
@@ -255,33 +410,41 @@ def execute_workflow(
     # Developer trace collection
     developer_trace: list[dict[str, Any]] = []
 
-    for node_name in order:
-        agent = agents.get(node_name)
-        if agent is None:
-            print(f"[Workflow] Warning: Agent '{node_name}' not found, skipping")
-            continue
-
-        print(f"[Workflow] Running agent: {node_name}")
-        try:
-            updates = agent(state) or {}
-            # Merge updates into state
-            for k, v in updates.items():
-                state[k] = v  # type: ignore[index]
-            
-            print(f"[Workflow] Agent '{node_name}' completed successfully")
-
-            if developer_mode:
-                # Capture a snapshot after this agent runs
-                snapshot_keys = [
-                    "parsed_data", "intent", "draft", "tone", "personalized_draft",
-                    "final_draft", "metadata"
-                ]
-                snapshot = {k: state.get(k) for k in snapshot_keys if k in state}
-                developer_trace.append({
-                    "agent": node_name,
-                    "snapshot": snapshot
-                })
-        except Exception as e:
+    for runnable in pipeline:
+        for node_name, _ in runnable:
+            print(f"[Workflow] Running agent: {node_name}")
+
+        # Independent nodes run concurrently against the same state; their
+        # updates are merged afterwards in order
+        if len(runnable) > 1:
+            executor = _get_node_executor()
+            futures = [(name, executor.submit(_run_node, agent, state)) for name, agent in runnable]
+            results = [(name, fut.result()) for name, fut in futures]
+        else:
+            results = [(name, _run_node(agent, state)) for name, agent in runnable]
+
+        for node_name, (updates, error) in results:
+            if error is None:
+                # Merge updates into state
+                if updates:
+                    state.update(updates)  # type: ignore[typeddict-item]
+                
+                print(f"[Workflow] Agent '{node_name}' completed successfully")
+
+                if developer_mode:
+                    # Capture a snapshot after this agent runs
+                    snapshot_keys = [
+                        "parsed_data", "intent", "draft", "tone", "personalized_draft",
+                        "final_draft", "metadata"
+                    ]
+                    snapshot = {k: state.get(k) for k in snapshot_keys if k in state}
+                    developer_trace.append({
+                        "agent": node_name,
+                        "snapshot": snapshot
+                    })
+                continue
+
+            e = error
             # If it's a Gemini quota/429 error, switch to the stubbed generator
             # immediately and return a usable state rather than continuing with
             # missing/partial fields.
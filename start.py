@@ -2,30 +2,136 @@
 Railway-compatible startup script
 Handles environment detection and service initialization
 """
+import importlib.util
 import os
 import sys
 import uvicorn
 
 
+def _fast_server_options() -> dict:
+    """Pin uvicorn to uvloop/httptools when they are installed.
+
+    uvicorn[standard] ships both (uvloop only off Windows); naming them
+    explicitly makes a missing extra show up in the startup log instead of
+    silently falling back to asyncio + h11.
+    """
+    options = {}
+    if sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None:
+        options["loop"] = "uvloop"
+    if importlib.util.find_spec("httptools") is not None:
+        options["http"] = "httptools"
+    return options
+
+
+try:
+    # Imports gunicorn, so this is None where Gunicorn is not installed
+    from uvicorn.workers import UvicornWorker
+except ImportError:
+    UvicornWorker = None
+
+
+if UvicornWorker is not None:
+    class FastUvicornWorker(UvicornWorker):
+        """Uvicorn worker for Gunicorn with the same loop/parser choice as uvicorn.run."""
+
+        CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, **_fast_server_options()}
+else:
+    FastUvicornWorker = None
+
+
+# Rough resident size of one worker (FastAPI + LangChain + Gemini client)
+_WORKER_MEMORY_BYTES = 512 * 1024 * 1024
+
+
+def _available_cpus() -> int:
+    """CPUs this process may use, honouring affinity and cgroup v2 quotas."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as fh:
+            quota, period = fh.read().split()[:2]
+        if quota != "max":
+            cpus = min(cpus, max(1, int(quota) // int(period)))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def _available_memory() -> int | None:
+    """Container memory limit in bytes, falling back to physical memory."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as fh:
+                value = fh.read().strip()
+            # cgroup v1 reports "unlimited" as a huge page-aligned number
+            if value != "max" and int(value) < 1 << 60:
+                return int(value)
+        except (OSError, ValueError):
+            continue
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _default_workers() -> int:
+    """Gunicorn's 2*CPU+1 rule, capped by how many workers fit in memory."""
+    workers = 2 * _available_cpus() + 1
+    memory = _available_memory()
+    if memory:
+        workers = min(workers, max(1, memory // _WORKER_MEMORY_BYTES))
+    return workers
+
+
+def _exec_gunicorn(port: int, workers: int) -> None:
+    """Replace this process with Gunicorn running Uvicorn workers.
+
+    ``--preload`` imports the app once in the master so forked workers share
+    those pages copy-on-write; ``--max-requests`` recycles workers before
+    slow memory growth becomes a problem. Returns only if Gunicorn cannot be
+    used (Windows or not installed).
+    """
+    if sys.platform == "win32" or FastUvicornWorker is None:
+        return
+    os.execvp("gunicorn", [
+        "gunicorn", "src.api.main:app",
+        "-k", "start:FastUvicornWorker",
+        "-w", str(workers),
+        "-b", f"0.0.0.0:{port}",
+        "--max-requests", "1000",
+        "--max-requests-jitter", "100",
+        "--preload",
+        "--log-level", "warning",
+        "--access-logfile", "-",
+        "--forwarded-allow-ips", "*",
+    ])
+
+
 def main():
     """Start the FastAPI application with Railway-compatible settings."""
-    # Railway sets PORT env var
-    port = int(os.getenv("PORT", 8000))
+    # Read the environment once; Railway sets PORT and RAILWAY_ENVIRONMENT
+    env = os.environ
+    port = int(env.get("PORT", 8000))
+    railway_env = env.get("RAILWAY_ENVIRONMENT")
+    web_concurrency = env.get("WEB_CONCURRENCY")
     
-    # Detect environment
-    is_production = os.getenv("RAILWAY_ENVIRONMENT") == "production"
-    is_railway = os.getenv("RAILWAY_ENVIRONMENT") is not None
+    # Detect environment; --production covers containers run outside Railway
+    is_production = railway_env == "production" or "--production" in sys.argv[1:]
+    is_railway = railway_env is not None
     
     # Configure based on environment
     config = {
         "app": "src.api.main:app",
         "host": "0.0.0.0",
         "port": port,
+        **_fast_server_options(),
     }
     
     if is_production or is_railway:
         # Production settings
-        workers = int(os.getenv("WEB_CONCURRENCY", 4))
+        workers = int(web_concurrency or _default_workers())
         config.update({
             "workers": workers,
             "log_level": "warning",
@@ -34,6 +140,9 @@ def main():
             "forwarded_allow_ips": "*",
         })
         print(f"🚀 Starting in PRODUCTION mode on port {port} with {workers} workers")
+        print(f"   Event loop: {config.get('loop', 'asyncio')}, HTTP parser: {config.get('http', 'h11')}")
+        _exec_gunicorn(port, workers)
+        print("   Gunicorn unavailable; falling back to uvicorn's worker supervisor")
     else:
         # Development settings
         config.update({
@@ -41,6 +150,7 @@ def main():
             "log_level": "info",
         })
         print(f"🔧 Starting in DEVELOPMENT mode on port {port}")
+        print(f"   Event loop: {config.get('loop', 'asyncio')}, HTTP parser: {config.get('http', 'h11')}")
     
     uvicorn.run(**config)
 
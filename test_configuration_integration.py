@@ -2,19 +2,29 @@
 """(Moved) Configuration integration test.
 
 Relocated under scripts/diagnostics for clarity; this root copy will be removed.
+
+The tests are independent (each overrides settings through ``monkeypatch``
+and only reads the shared .env file), so they can be spread across workers
+with pytest-xdist:
+
+    pytest -n auto test_configuration_integration.py
 """
 
+import importlib
 import os
 import sys
 import tempfile
 from pathlib import Path
 
+import pytest
+
 # Add src to path for testing
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-def create_test_env_file():
-    """Create a temporary .env file for testing."""
-    env_content = """
+_TEST_ENV_BYTES = b"""
+# Required by Settings
+GEMINI_API_KEY=test-gemini-key
+
 # Redis Configuration
 ENABLE_REDIS=true
 DISABLE_REDIS=false
@@ -22,8 +32,8 @@ REDIS_HOST=test-redis-host
 REDIS_PORT=6380
 REDIS_DB=1
 REDIS_PASSWORD=test-password
-REDIS_SOCKET_TIMEOUT=35.0
-REDIS_SOCKET_CONNECT_TIMEOUT=35.0
+REDIS_SOCKET_TIMEOUT=35
+REDIS_SOCKET_CONNECT_TIMEOUT=35
 REDIS_RETRY_ON_TIMEOUT=true
 REDIS_HEALTH_CHECK_INTERVAL=35
 
@@ -67,275 +77,192 @@ MCP_SERVER_NAME=test-email-generator-mcp-server
 MCP_SERVER_VERSION=1.0.0-test
 MCP_CLIENT_TIMEOUT=45.0
 """
-    
-    # Write to temporary file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.env', delete=False) as f:
-        f.write(env_content)
-        return f.name
 
-def test_configuration_loading():
+_DISABLED_SETTINGS = {
+    "enable_redis": False,
+    "enable_chromadb": False,
+    "enable_gmail": False,
+    "enable_oauth": False,
+    "enable_mcp": False,
+}
+
+
+def _write_env_file(directory, content):
+    """Write ``content`` (bytes) to ``directory``/.env and return its path."""
+    path = Path(directory) / ".env"
+    path.write_bytes(content)
+    return str(path)
+
+
+# Write the .env file to RAM-backed /dev/shm where available (Linux) so it
+# never touches a disk-backed /tmp; None falls back to the default temp dir
+_TMPFS_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+
+# Only test_configuration_loading goes through the .env loader. The file is
+# never written to after setup, so one copy per module (per xdist worker) is safe
+@pytest.fixture(scope="module")
+def env_file():
+    """Path of the test .env file (written once per module)."""
+    with tempfile.TemporaryDirectory(prefix="cfg-", dir=_TMPFS_DIR) as tmp_dir:
+        yield _write_env_file(tmp_dir, _TEST_ENV_BYTES)
+
+
+def _patch_settings(monkeypatch, module, values):
+    """Override ``values`` on the settings object ``module`` reads.
+
+    Factories read the module-level ``app_settings`` bound at import, so env
+    vars set afterwards never reach them; test_configuration_loading covers
+    the .env path.
+    """
+    for key, value in values.items():
+        monkeypatch.setattr(module.app_settings, key, value, raising=False)
+
+def test_configuration_loading(env_file):
     """Test that configuration loads from .env file."""
-    env_file = create_test_env_file()
+    # Load Settings straight from the test file; the module-level singleton
+    # (utils.config.settings / get_settings()) was loaded from the real .env
+    from utils.config import settings_from_env_file
+    app_settings = settings_from_env_file(env_file)
     
-    try:
-        # Set environment variable to point to test .env file
-        os.environ['SETTINGS_ENV_FILE'] = env_file
-        
-        # Import configuration (this will load the test .env file)
-        from utils.config import app_settings
-        
-        # Test Redis configuration
-        assert app_settings.enable_redis == True
-        assert app_settings.redis_host == "test-redis-host"
-        assert app_settings.redis_port == 6380
-        assert app_settings.redis_password == "test-password"
-        
-        # Test ChromaDB configuration
-        assert app_settings.enable_chromadb == True
-        assert app_settings.chromadb_host == "test-chroma-host"
-        assert app_settings.chromadb_port == 8001
-        
-        # Test Gmail configuration
-        assert app_settings.enable_gmail == True
-        assert app_settings.gmail_credentials_file == "test/gmail_credentials.json"
-        
-        # Test OAuth configuration
-        assert app_settings.enable_oauth == True
-        assert app_settings.google_client_id == "test_google_client_id"
-        assert app_settings.github_client_secret == "test_github_client_secret"
-        
-        # Test MCP configuration
-        assert app_settings.enable_mcp == True
-        assert app_settings.mcp_server_host == "test-mcp-host"
-        assert app_settings.mcp_server_port == 8766
-        
-        print("✅ Configuration loading test PASSED")
-        
-    finally:
-        # Clean up
-        os.unlink(env_file)
-        if 'SETTINGS_ENV_FILE' in os.environ:
-            del os.environ['SETTINGS_ENV_FILE']
-
-def test_redis_cache_configuration():
-    """Test that Redis cache uses configuration."""
-    env_file = create_test_env_file()
+    # Test Redis configuration
+    assert app_settings.enable_redis == True
+    assert app_settings.redis_host == "test-redis-host"
+    assert app_settings.redis_port == 6380
+    assert app_settings.redis_password == "test-password"
     
-    try:
-        os.environ['SETTINGS_ENV_FILE'] = env_file
-        
-        from cache.redis_cache import create_redis_cache
-        
-        # Test factory function respects configuration
-        cache = create_redis_cache()
-        if cache:
-            # Redis would be None if not available, but config should be used
-            assert cache.host == "test-redis-host"
-            assert cache.port == 6380
-            print("✅ Redis configuration test PASSED")
-        else:
-            print("ℹ️ Redis configuration test SKIPPED (Redis not available)")
-            
-    except ImportError as e:
-        print(f"ℹ️ Redis configuration test SKIPPED: {e}")
-    finally:
-        os.unlink(env_file)
-        if 'SETTINGS_ENV_FILE' in os.environ:
-            del os.environ['SETTINGS_ENV_FILE']
-
-def test_chromadb_configuration():
-    """Test that ChromaDB uses configuration."""
-    env_file = create_test_env_file()
+    # Test ChromaDB configuration
+    assert app_settings.enable_chromadb == True
+    assert app_settings.chromadb_host == "test-chroma-host"
+    assert app_settings.chromadb_port == 8001
     
-    try:
-        os.environ['SETTINGS_ENV_FILE'] = env_file
-        
-        from context.chroma_context import create_chroma_context
-        
-        # Test factory function respects configuration
-        context = create_chroma_context()
-        if context:
-            assert context.host == "test-chroma-host"
-            assert context.port == 8001
-            print("✅ ChromaDB configuration test PASSED")
-        else:
-            print("ℹ️ ChromaDB configuration test SKIPPED (ChromaDB not available)")
-            
-    except ImportError as e:
-        print(f"ℹ️ ChromaDB configuration test SKIPPED: {e}")
-    finally:
-        os.unlink(env_file)
-        if 'SETTINGS_ENV_FILE' in os.environ:
-            del os.environ['SETTINGS_ENV_FILE']
-
-def test_gmail_configuration():
-    """Test that Gmail service uses configuration."""
-    env_file = create_test_env_file()
+    # Test Gmail configuration
+    assert app_settings.enable_gmail == True
+    assert app_settings.gmail_credentials_file == "test/gmail_credentials.json"
     
-    try:
-        os.environ['SETTINGS_ENV_FILE'] = env_file
-        
-        from integrations.gmail_service import create_gmail_service
-        
-        # Test factory function respects configuration
-        service = create_gmail_service()
-        if service:
-            assert service.credentials_file == "test/gmail_credentials.json"
-            assert service.token_file == "test/gmail_token.json"
-            print("✅ Gmail configuration test PASSED")
-        else:
-            print("ℹ️ Gmail configuration test SKIPPED (credentials not available)")
-            
-    except ImportError as e:
-        print(f"ℹ️ Gmail configuration test SKIPPED: {e}")
-    finally:
-        os.unlink(env_file)
-        if 'SETTINGS_ENV_FILE' in os.environ:
-            del os.environ['SETTINGS_ENV_FILE']
-
-def test_oauth_configuration():
-    """Test that OAuth manager uses configuration."""
-    env_file = create_test_env_file()
+    # Test OAuth configuration
+    assert app_settings.enable_oauth == True
+    assert app_settings.google_client_id == "test_google_client_id"
+    assert app_settings.github_client_secret == "test_github_client_secret"
     
-    try:
-        os.environ['SETTINGS_ENV_FILE'] = env_file
-        
-        from auth.oauth_providers import create_oauth_manager
-        
-        # Test factory function respects configuration
-        manager = create_oauth_manager()
-        if manager:
-            # Check that providers are loaded from configuration
-            assert 'google' in manager.providers
-            assert manager.providers['google'].client_id == "test_google_client_id"
-            print("✅ OAuth configuration test PASSED")
-        else:
-            print("ℹ️ OAuth configuration test SKIPPED (OAuth not available)")
-            
-    except ImportError as e:
-        print(f"ℹ️ OAuth configuration test SKIPPED: {e}")
-    finally:
-        os.unlink(env_file)
-        if 'SETTINGS_ENV_FILE' in os.environ:
-            del os.environ['SETTINGS_ENV_FILE']
-
-def test_mcp_configuration():
-    """Test that MCP integration uses configuration."""
-    env_file = create_test_env_file()
+    # Test MCP configuration
+    assert app_settings.enable_mcp == True
+    assert app_settings.mcp_server_host == "test-mcp-host"
+    assert app_settings.mcp_server_port == 8766
     
+    print("✅ Configuration loading test PASSED")
+
+# Settings each factory test overrides, keyed by subsystem: (module, values).
+# Modules are imported through the src package so their relative config import
+# binds the real settings rather than the standalone MockSettings fallback
+_FACTORY_SETTINGS = {
+    "redis": ("src.cache.redis_cache", {
+        "enable_redis": True,
+        "redis_host": "test-redis-host",
+        "redis_port": 6380,
+    }),
+    "chroma": ("src.context.chroma_context", {
+        "enable_chromadb": True,
+        "chromadb_host": "test-chroma-host",
+        "chromadb_port": 8001,
+    }),
+    "gmail": ("src.integrations.gmail_service", {
+        "enable_gmail": True,
+        "gmail_credentials_file": "test/gmail_credentials.json",
+        "gmail_token_file": "test/gmail_token.json",
+    }),
+    "oauth": ("src.auth.oauth_providers", {
+        "enable_oauth": True,
+        "enable_google_oauth": True,
+        "google_client_id": "test_google_client_id",
+        "google_client_secret": "test_google_client_secret",
+    }),
+    "mcp": ("src.integrations.mcp_integration", {
+        "enable_mcp": True,
+        "mcp_server_host": "test-mcp-host",
+        "mcp_server_port": 8766,
+        "mcp_server_name": "test-email-generator-mcp-server",
+        "mcp_client_timeout": 45.0,
+    }),
+}
+
+# Factories each module exposes; all return None when their subsystem is off
+_FACTORIES = {
+    "src.cache.redis_cache": ("create_redis_cache",),
+    "src.context.chroma_context": ("create_chroma_context_manager",),
+    "src.integrations.gmail_service": ("create_gmail_service",),
+    "src.auth.oauth_providers": ("create_oauth_manager",),
+    "src.integrations.mcp_integration": ("create_mcp_server", "create_mcp_client"),
+}
+
+
+def _import_factory_module(name):
+    """Import a factory module, skipping the test if its packages are missing."""
     try:
-        os.environ['SETTINGS_ENV_FILE'] = env_file
-        
-        from integrations.mcp_integration import create_mcp_server, create_mcp_client
-        
-        # Test factory functions respect configuration
-        server = create_mcp_server()
-        client = create_mcp_client()
-        
+        return importlib.import_module(name)
+    except ImportError as e:
+        pytest.skip(f"{name} unavailable: {e}")
+
+
+@pytest.mark.parametrize("subsystem", list(_FACTORY_SETTINGS))
+def test_factory_uses_config(subsystem, monkeypatch, tmp_path):
+    """Test that each component factory uses configuration."""
+    monkeypatch.chdir(tmp_path)  # factories create local stores under relative paths
+    module_name, values = _FACTORY_SETTINGS[subsystem]
+    module = _import_factory_module(module_name)
+    _patch_settings(monkeypatch, module, values)
+
+    if subsystem == "redis":
+        cache = module.create_redis_cache()
+        if not cache:
+            pytest.skip("Redis not available")
+        assert cache.host == values["redis_host"]
+        assert cache.port == values["redis_port"]
+
+    elif subsystem == "chroma":
+        context = module.create_chroma_context_manager()
+        if not context:
+            pytest.skip("ChromaDB not available")
+        assert context.host == values["chromadb_host"]
+        assert context.port == values["chromadb_port"]
+
+    elif subsystem == "gmail":
+        service = module.create_gmail_service()
+        if not service:
+            pytest.skip("Gmail client libraries not available")
+        assert service.credentials_file == values["gmail_credentials_file"]
+        assert service.token_file == values["gmail_token_file"]
+
+    elif subsystem == "oauth":
+        manager = module.create_oauth_manager()
+        if not manager:
+            pytest.skip("OAuth not available")
+        # Providers are loaded from configuration
+        assert 'google' in manager.providers
+        assert manager.providers['google'].client_id == values["google_client_id"]
+
+    elif subsystem == "mcp":
+        server = module.create_mcp_server()
+        client = module.create_mcp_client()
+        if not (server or client):
+            pytest.skip("MCP not available")
         if server:
-            assert server.server_host == "test-mcp-host"
-            assert server.server_port == 8766
-            assert server.server_info["name"] == "test-email-generator-mcp-server"
-            print("✅ MCP Server configuration test PASSED")
-        
+            assert server.server_host == values["mcp_server_host"]
+            assert server.server_port == values["mcp_server_port"]
+            assert server.server_info["name"] == values["mcp_server_name"]
         if client:
-            assert client.timeout == 45.0
-            print("✅ MCP Client configuration test PASSED")
-            
-    except ImportError as e:
-        print(f"ℹ️ MCP configuration test SKIPPED: {e}")
-    finally:
-        os.unlink(env_file)
-        if 'SETTINGS_ENV_FILE' in os.environ:
-            del os.environ['SETTINGS_ENV_FILE']
+            assert client.timeout == values["mcp_client_timeout"]
+
 
-def test_disabled_components():
+@pytest.mark.parametrize("module_name", list(_FACTORIES))
+def test_disabled_components(module_name, monkeypatch):
     """Test that components can be disabled via configuration."""
-    env_content = """
-DISABLE_REDIS=true
-DISABLE_CHROMADB=true
-DISABLE_GMAIL=true
-DISABLE_OAUTH=true
-DISABLE_MCP=true
-"""
-    
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.env', delete=False) as f:
-        f.write(env_content)
-        env_file = f.name
-    
-    try:
-        os.environ['SETTINGS_ENV_FILE'] = env_file
-        
-        # Import factory functions
-        try:
-            from cache.redis_cache import create_redis_cache
-            assert create_redis_cache() is None
-            print("✅ Redis disable test PASSED")
-        except ImportError:
-            print("ℹ️ Redis disable test SKIPPED")
-        
-        try:
-            from context.chroma_context import create_chroma_context
-            assert create_chroma_context() is None
-            print("✅ ChromaDB disable test PASSED")
-        except ImportError:
-            print("ℹ️ ChromaDB disable test SKIPPED")
-        
-        try:
-            from integrations.gmail_service import create_gmail_service
-            assert create_gmail_service() is None
-            print("✅ Gmail disable test PASSED")
-        except ImportError:
-            print("ℹ️ Gmail disable test SKIPPED")
-        
-        try:
-            from auth.oauth_providers import create_oauth_manager
-            assert create_oauth_manager() is None
-            print("✅ OAuth disable test PASSED")
-        except ImportError:
-            print("ℹ️ OAuth disable test SKIPPED")
-        
-        try:
-            from integrations.mcp_integration import create_mcp_server, create_mcp_client
-            assert create_mcp_server() is None
-            assert create_mcp_client() is None
-            print("✅ MCP disable test PASSED")
-        except ImportError:
-            print("ℹ️ MCP disable test SKIPPED")
-            
-    finally:
-        os.unlink(env_file)
-        if 'SETTINGS_ENV_FILE' in os.environ:
-            del os.environ['SETTINGS_ENV_FILE']
-
-def main():
-    """Run all configuration tests."""
-    print("🧪 Testing Configuration Integration...")
-    print("=" * 50)
-    
-    try:
-        test_configuration_loading()
-        test_redis_cache_configuration()
-        test_chromadb_configuration()
-        test_gmail_configuration()
-        test_oauth_configuration()
-        test_mcp_configuration()
-        test_disabled_components()
-        
-        print("\n" + "=" * 50)
-        print("🎉 All configuration tests completed!")
-        print("\n✅ Configuration integration is working correctly")
-        print("✅ All components respect .env settings")
-        print("✅ Components can be enabled/disabled via configuration")
-        print("✅ Factory functions use centralized settings")
-        
-    except Exception as e:
-        print(f"\n❌ Configuration test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
-    
-    return 0
+    module = _import_factory_module(module_name)
+    _patch_settings(monkeypatch, module, _DISABLED_SETTINGS)
+
+    for name in _FACTORIES[module_name]:
+        assert getattr(module, name)() is None, name
+
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(pytest.main([__file__]))
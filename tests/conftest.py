@@ -0,0 +1,130 @@
+"""Shared fixtures for the test suite."""
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "network: calls live Gemini/LangSmith services (run with -m network)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Deselect network tests unless a -m expression picks what to run."""
+    if config.getoption("markexpr"):
+        return
+    network = [item for item in items if item.get_closest_marker("network")]
+    if network:
+        config.hook.pytest_deselected(items=network)
+        items[:] = [item for item in items if not item.get_closest_marker("network")]
+
+
+class DummyLLM:
+    model = "stub"
+
+
+# Stateless, so every test can share one instance
+_STUB_LLM = DummyLLM()
+
+
+@pytest.fixture(scope="session")
+def agents():
+    """Agent classes, imported once per session (only by tests that use them)."""
+    from src.agents.input_parser import InputParserAgent, ParsedInput
+    from src.agents.intent_detector import IntentDetectorAgent, EmailIntent
+    from src.agents.draft_writer import DraftWriterAgent
+    from src.agents.tone_stylist import ToneStylistAgent
+    from src.agents.personalization import PersonalizationAgent
+    from src.agents.review import ReviewAgent
+    from src.agents.router import RouterAgent
+
+    return SimpleNamespace(
+        InputParserAgent=InputParserAgent,
+        ParsedInput=ParsedInput,
+        IntentDetectorAgent=IntentDetectorAgent,
+        EmailIntent=EmailIntent,
+        DraftWriterAgent=DraftWriterAgent,
+        ToneStylistAgent=ToneStylistAgent,
+        PersonalizationAgent=PersonalizationAgent,
+        ReviewAgent=ReviewAgent,
+        RouterAgent=RouterAgent,
+    )
+
+
+@pytest.fixture(scope="session")
+def llm_wrapper_cls():
+    """LLMWrapper, imported once per session (loads the settings and metrics modules)."""
+    from src.utils.llm_wrapper import LLMWrapper
+
+    return LLMWrapper
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    """A placeholder LLM with Gemini disabled, so agents take their fallback paths."""
+    monkeypatch.setenv("DONOTUSEGEMINI", "1")
+    return _STUB_LLM
+
+
+def _offline_embed(*args, **kwargs):
+    raise ConnectionError("network disabled in tests")
+
+
+# Stands in for google.generativeai: configure() succeeds, but any request
+# fails at once, so callers take their local fallbacks
+_OFFLINE_GENAI = SimpleNamespace(
+    configure=lambda *args, **kwargs: None,
+    embed_content=_offline_embed,
+    GenerativeModel=lambda *args, **kwargs: SimpleNamespace(
+        generate_content=lambda *args, **kwargs: SimpleNamespace(text="stub")
+    ),
+)
+
+
+@pytest.fixture
+def no_network(monkeypatch):
+    """Run workflow code with Gemini stubbed out and no Gemini SDK traffic.
+
+    Sets DONOTUSEGEMINI (a test may still unset it to exercise the LLM path)
+    and swaps google.generativeai, used for draft embeddings, for an offline
+    stand-in.
+    """
+    monkeypatch.setenv("DONOTUSEGEMINI", "1")
+    monkeypatch.setitem(sys.modules, "google.generativeai", _OFFLINE_GENAI)
+    vector_store = sys.modules.get("src.utils.vector_store")
+    if vector_store is not None:
+        # Drop a real SDK module configured by an earlier test
+        monkeypatch.setattr(vector_store, "_genai_mod", None)
+
+
+@pytest.fixture
+def mem_store(monkeypatch):
+    """Keep UserManager/SessionManager data in a dict instead of JSON files.
+
+    Returns the dict, keyed by each manager's file path. Managers built on the
+    same path share data, as they would through the file.
+    """
+    from src.auth import SessionManager, UserManager
+
+    store = {}
+
+    def load(path_attr, data_attr):
+        def _load(self):
+            setattr(self, data_attr, store.setdefault(getattr(self, path_attr), {}))
+        return _load
+
+    def save(path_attr, data_attr):
+        def _save(self):
+            store[getattr(self, path_attr)] = getattr(self, data_attr)
+        return _save
+
+    for cls, path_attr, data_attr in (
+        (UserManager, "users_file", "users"),
+        (SessionManager, "sessions_file", "sessions"),
+    ):
+        monkeypatch.setattr(cls, "_ensure_data_dir", lambda self: None)
+        monkeypatch.setattr(cls, f"_load_{data_attr}", load(path_attr, data_attr))
+        monkeypatch.setattr(cls, f"_save_{data_attr}", save(path_attr, data_attr))
+    return store
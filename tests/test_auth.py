@@ -3,33 +3,50 @@
 Run with: pytest tests/test_auth.py
 """
 
+import uuid
+
 import pytest
-import os
-import json
-import tempfile
 from src.auth import AuthManager, UserManager, SessionManager
 
 
+@pytest.fixture(scope="session")
+def auth_data_dir(tmp_path_factory):
+    """One temporary directory shared by every test's data files."""
+    return tmp_path_factory.mktemp("auth", numbered=False)
+
+
+# Most tests run against the in-memory mem_store (see conftest.py); the
+# per-test file paths only matter for TestJsonPersistence
+@pytest.fixture
+def users_file(auth_data_dir):
+    """Path of a users file no other test writes to."""
+    return str(auth_data_dir / f"users_{uuid.uuid4().hex}.json")
+
+
 @pytest.fixture
-def temp_dir():
-    """Create temporary directory for test data."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
+def sessions_file(auth_data_dir):
+    """Path of a sessions file no other test writes to."""
+    return str(auth_data_dir / f"sessions_{uuid.uuid4().hex}.json")
 
 
 @pytest.fixture
-def auth_manager(temp_dir):
+def auth_manager(users_file, sessions_file):
     """Create AuthManager with temporary file storage."""
-    users_file = os.path.join(temp_dir, "users.json")
-    sessions_file = os.path.join(temp_dir, "sessions.json")
     return AuthManager(users_file=users_file, sessions_file=sessions_file)
 
 
+@pytest.fixture
+def logged_in(auth_manager):
+    """Login result for test@example.com / TestPass123, registered on auth_manager."""
+    auth_manager.register("test@example.com", "TestPass123", "Test User")
+    return auth_manager.login("test@example.com", "TestPass123")
+
+
+@pytest.mark.usefixtures("mem_store")
 class TestUserManager:
     """Test UserManager functionality."""
 
-    def test_register_user(self, temp_dir):
-        users_file = os.path.join(temp_dir, "users.json")
+    def test_register_user(self, users_file):
         user_mgr = UserManager(users_file)
         result = user_mgr.register_user(
             email="test@example.com", password="TestPass123", full_name="Test User"
@@ -37,29 +54,25 @@ class TestUserManager:
         assert result["success"] is True
         assert "user_id" in result
 
-    def test_register_duplicate_email(self, temp_dir):
-        users_file = os.path.join(temp_dir, "users.json")
+    @pytest.mark.parametrize("email, password, error", [
+        ("test@example.com", "Pass45678", "already exists"),
+        ("TEST@example.com ", "Pass45678", "already exists"),
+        ("new@example.com", "short", "at least 8 characters"),
+    ])
+    def test_register_rejects(self, users_file, email, password, error):
         user_mgr = UserManager(users_file)
         user_mgr.register_user("test@example.com", "Pass1234", "User One")
-        with pytest.raises(ValueError, match="already exists"):
-            user_mgr.register_user("test@example.com", "Pass45678", "User Two")
-
-    def test_short_password(self, temp_dir):
-        users_file = os.path.join(temp_dir, "users.json")
-        user_mgr = UserManager(users_file)
-        with pytest.raises(ValueError, match="at least 8 characters"):
-            user_mgr.register_user("test@example.com", "short", "Test User")
+        with pytest.raises(ValueError, match=error):
+            user_mgr.register_user(email, password, "User Two")
 
-    def test_verify_credentials(self, temp_dir):
-        users_file = os.path.join(temp_dir, "users.json")
+    def test_verify_credentials(self, users_file):
         user_mgr = UserManager(users_file)
         user_mgr.register_user("test@example.com", "TestPass123", "Test User")
         assert user_mgr.verify_credentials("test@example.com", "TestPass123") is True
         assert user_mgr.verify_credentials("test@example.com", "WrongPass") is False
         assert user_mgr.verify_credentials("nobody@example.com", "Pass1234") is False
 
-    def test_get_user(self, temp_dir):
-        users_file = os.path.join(temp_dir, "users.json")
+    def test_get_user(self, users_file):
         user_mgr = UserManager(users_file)
         user_mgr.register_user("test@example.com", "Pass1234", "Test User")
         user = user_mgr.get_user("test@example.com")
@@ -69,8 +82,7 @@ class TestUserManager:
         assert "password_hash" not in user
         assert "salt" not in user
 
-    def test_change_password(self, temp_dir):
-        users_file = os.path.join(temp_dir, "users.json")
+    def test_change_password(self, users_file):
         user_mgr = UserManager(users_file)
         user_mgr.register_user("test@example.com", "OldPass123", "Test User")
         success = user_mgr.change_password("test@example.com", "OldPass123", "NewPass456")
@@ -79,12 +91,12 @@ class TestUserManager:
         assert user_mgr.verify_credentials("test@example.com", "NewPass456") is True
 
 
+@pytest.mark.usefixtures("mem_store")
 class TestSessionManager:
     """Test SessionManager functionality."""
     
-    def test_create_session(self, temp_dir):
+    def test_create_session(self, sessions_file):
         """Test session creation."""
-        sessions_file = os.path.join(temp_dir, "sessions.json")
         session_mgr = SessionManager(sessions_file)
         
         token = session_mgr.create_session(
@@ -95,9 +107,8 @@ class TestSessionManager:
         assert token is not None
         assert len(token) > 0
     
-    def test_get_session(self, temp_dir):
+    def test_get_session(self, sessions_file):
         """Test getting session information."""
-        sessions_file = os.path.join(temp_dir, "sessions.json")
         session_mgr = SessionManager(sessions_file)
         
         token = session_mgr.create_session("test@example.com", "user123")
@@ -107,9 +118,8 @@ class TestSessionManager:
         assert session["email"] == "test@example.com"
         assert session["user_id"] == "user123"
     
-    def test_is_valid(self, temp_dir):
+    def test_is_valid(self, sessions_file):
         """Test session validation."""
-        sessions_file = os.path.join(temp_dir, "sessions.json")
         session_mgr = SessionManager(sessions_file)
         
         token = session_mgr.create_session("test@example.com", "user123")
@@ -117,9 +127,8 @@ class TestSessionManager:
         assert session_mgr.is_valid(token) is True
         assert session_mgr.is_valid("invalid_token") is False
     
-    def test_delete_session(self, temp_dir):
+    def test_delete_session(self, sessions_file):
         """Test session deletion."""
-        sessions_file = os.path.join(temp_dir, "sessions.json")
         session_mgr = SessionManager(sessions_file)
         
         token = session_mgr.create_session("test@example.com", "user123")
@@ -131,6 +140,7 @@ class TestSessionManager:
         assert session_mgr.is_valid(token) is False
 
 
+@pytest.mark.usefixtures("mem_store")
 class TestAuthManager:
     """Test AuthManager functionality."""
     
@@ -145,13 +155,9 @@ class TestAuthManager:
         assert result["success"] is True
         assert "user_id" in result
     
-    def test_login(self, auth_manager):
+    def test_login(self, logged_in):
         """Test login functionality."""
-        # Register user
-        auth_manager.register("test@example.com", "TestPass123", "Test User")
-        
-        # Login
-        result = auth_manager.login("test@example.com", "TestPass123")
+        result = logged_in
         
         assert result["success"] is True
         assert "token" in result
@@ -167,20 +173,16 @@ class TestAuthManager:
         assert result["success"] is False
         assert "error" in result
     
-    def test_is_authenticated(self, auth_manager):
+    def test_is_authenticated(self, auth_manager, logged_in):
         """Test authentication check."""
-        auth_manager.register("test@example.com", "TestPass123", "Test User")
-        result = auth_manager.login("test@example.com", "TestPass123")
-        token = result["token"]
+        token = logged_in["token"]
         
         assert auth_manager.is_authenticated(token) is True
         assert auth_manager.is_authenticated("invalid_token") is False
     
-    def test_get_current_user(self, auth_manager):
+    def test_get_current_user(self, auth_manager, logged_in):
         """Test getting current user."""
-        auth_manager.register("test@example.com", "TestPass123", "Test User")
-        result = auth_manager.login("test@example.com", "TestPass123")
-        token = result["token"]
+        token = logged_in["token"]
         
         user = auth_manager.get_current_user(token)
         
@@ -188,11 +190,9 @@ class TestAuthManager:
         assert user["email"] == "test@example.com"
         assert user["full_name"] == "Test User"
     
-    def test_logout(self, auth_manager):
+    def test_logout(self, auth_manager, logged_in):
         """Test logout functionality."""
-        auth_manager.register("test@example.com", "TestPass123", "Test User")
-        result = auth_manager.login("test@example.com", "TestPass123")
-        token = result["token"]
+        token = logged_in["token"]
         
         assert auth_manager.is_authenticated(token) is True
         
@@ -216,19 +216,17 @@ class TestAuthManager:
         with pytest.raises(ValueError, match="Role 'admin' required"):
             auth_manager.require_role(user_token, "admin")
     
-    def test_change_password(self, auth_manager):
+    def test_change_password(self, auth_manager, logged_in):
         """Test password change."""
-        auth_manager.register("test@example.com", "OldPass123", "Test User")
-        result = auth_manager.login("test@example.com", "OldPass123")
-        token = result["token"]
+        token = logged_in["token"]
         
         # Change password
-        result = auth_manager.change_password(token, "OldPass123", "NewPass456")
+        result = auth_manager.change_password(token, "TestPass123", "NewPass456")
         
         assert result["success"] is True
         
         # Old password should not work
-        login_result = auth_manager.login("test@example.com", "OldPass123")
+        login_result = auth_manager.login("test@example.com", "TestPass123")
         assert login_result["success"] is False
         
         # New password should work
@@ -236,5 +234,16 @@ class TestAuthManager:
         assert login_result["success"] is True
 
 
+class TestJsonPersistence:
+    """Test that managers read back what they wrote to disk."""
+
+    def test_users_and_sessions_round_trip(self, users_file, sessions_file):
+        UserManager(users_file).register_user("test@example.com", "TestPass123", "Test User")
+        token = SessionManager(sessions_file).create_session("test@example.com", "user123")
+
+        assert UserManager(users_file).verify_credentials("test@example.com", "TestPass123") is True
+        assert SessionManager(sessions_file).is_valid(token) is True
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from src.utils.batcher import PromptBatcher
+
+
+def test_concurrent_submits_share_one_flush():
+    calls = []
+
+    def flush(key, payloads):
+        calls.append((key, list(payloads)))
+        return [p.upper() for p in payloads]
+
+    batcher = PromptBatcher(flush, max_batch=4, max_wait_ms=500)
+    results = {}
+
+    def submit(text):
+        results[text] = batcher.submit("review", text)
+
+    threads = [threading.Thread(target=submit, args=(t,)) for t in ("a", "b", "c", "d")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=2)
+
+    assert results == {"a": "A", "b": "B", "c": "C", "d": "D"}
+    assert len(calls) == 1
+    assert sorted(calls[0][1]) == ["a", "b", "c", "d"]
+
+
+def test_flush_error_reaches_caller():
+    def flush(key, payloads):
+        raise ValueError("provider down")
+
+    batcher = PromptBatcher(flush, max_batch=1, max_wait_ms=0)
+    with pytest.raises(ValueError):
+        batcher.submit("intent", "x")
+
+
+def test_per_item_error_reaches_only_its_caller():
+    def flush(key, payloads):
+        return [ValueError(p) if p == "bad" else p.upper() for p in payloads]
+
+    batcher = PromptBatcher(flush, max_batch=2, max_wait_ms=500)
+    results = {}
+
+    def submit(text):
+        try:
+            results[text] = batcher.submit("review", text)
+        except ValueError as exc:
+            results[text] = f"error: {exc}"
+
+    threads = [threading.Thread(target=submit, args=(t,)) for t in ("ok", "bad")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=2)
+
+    assert results == {"ok": "OK", "bad": "error: bad"}
@@ -1,14 +1,20 @@
 import time
 import pytest
 
-from src.utils.llm_wrapper import LLMWrapper
-
 
 class DummyError(Exception):
     pass
 
 
-def test_run_with_retries_exponential_backoff(monkeypatch):
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of sleeping through them."""
+    delays = []
+    monkeypatch.setattr(time, "sleep", delays.append)
+    return delays
+
+
+def test_run_with_retries_exponential_backoff(llm_wrapper_cls, sleeps):
     calls = {"count": 0}
 
     def flaky_call():
@@ -17,48 +23,54 @@ def test_run_with_retries_exponential_backoff(monkeypatch):
             raise DummyError("temporary failure")
         return "ok"
 
-    wrapper = LLMWrapper(llm=None, max_retries=3, initial_backoff=0.01, backoff_factor=1.0, max_backoff=0.05)
+    wrapper = llm_wrapper_cls(llm=None, max_retries=3, initial_backoff=0.01, backoff_factor=1.0, max_backoff=0.05)
 
-    start = time.time()
     result = wrapper.run_with_retries(flaky_call)
-    elapsed = time.time() - start
 
     assert result == "ok"
     assert calls["count"] == 3
-    # elapsed should be small due to tiny backoff
-    assert elapsed < 0.5
+    # One backoff per failed attempt, as scheduled (no real waiting)
+    assert sleeps == [0.01, 0.01]
 
 
-def test_run_with_retries_server_suggested_delay(monkeypatch):
-    calls = {"count": 0}
+@pytest.mark.parametrize("message, expected", [
+    ("Please retry in 0.02s", 0.02),
+    ("429 Resource has been exhausted. Please retry in 12.5s.", 12.5),
+    ("retry-after: 30", 30.0),
+    ("retry_after=3", 3.0),
+    ("retry_delay {\n  seconds: 7\n}", 7.0),
+    ("permanent", None),
+])
+def test_parse_retry_delay(llm_wrapper_cls, message, expected):
+    assert llm_wrapper_cls._parse_retry_delay(DummyError(message)) == expected
+
 
-    class Suggested(Exception):
-        def __str__(self):
-            return "Please retry in 0.02s"
+def test_run_with_retries_server_suggested_delay(llm_wrapper_cls, sleeps, monkeypatch):
+    calls = {"count": 0}
 
     def flaky_call():
         calls["count"] += 1
         if calls["count"] < 2:
-            raise Suggested()
+            raise DummyError("rate limited")
         return "ok"
 
-    wrapper = LLMWrapper(llm=None, max_retries=2, initial_backoff=0.5, backoff_factor=10.0, max_backoff=0.5)
+    wrapper = llm_wrapper_cls(llm=None, max_retries=2, initial_backoff=0.5, backoff_factor=10.0, max_backoff=0.5)
+    monkeypatch.setattr(wrapper, "_parse_retry_delay", lambda exc: 0.02)
 
-    start = time.time()
     result = wrapper.run_with_retries(flaky_call)
-    elapsed = time.time() - start
 
     assert result == "ok"
     assert calls["count"] == 2
-    # Because of server-suggested 0.02s, elapsed should be well below the large defaults
-    assert elapsed < 0.3
+    # The server-suggested 0.02s wins over the 0.5s backoff
+    assert sleeps == [0.02]
 
 
-def test_run_with_retries_exhaustion_raises():
+def test_run_with_retries_exhaustion_raises(llm_wrapper_cls, sleeps):
     def always_fail():
         raise DummyError("permanent")
 
-    wrapper = LLMWrapper(llm=None, max_retries=1, initial_backoff=0.01, backoff_factor=1.0, max_backoff=0.05)
+    wrapper = llm_wrapper_cls(llm=None, max_retries=1, initial_backoff=0.01, backoff_factor=1.0, max_backoff=0.05)
 
     with pytest.raises(Exception):
         wrapper.run_with_retries(always_fail)
+    assert sleeps == [0.01]
@@ -0,0 +1,11 @@
+from src.utils.prompt_compression import compact_whitespace
+
+
+def test_compact_whitespace_keeps_paragraphs():
+    draft = "Hi John,  \r\n\r\n\r\nThanks for\t\tthe update.   \n\n\n\nBest,\nAna  "
+    assert compact_whitespace(draft) == "Hi John,\n\nThanks for the update.\n\nBest,\nAna"
+
+
+def test_compact_whitespace_leaves_clean_text_unchanged():
+    draft = "Hi John,\n\n- item one\n- item two\n\nBest,\nAna"
+    assert compact_whitespace(draft) == draft
@@ -1,14 +1,17 @@
 import pytest
 from src.workflow.langgraph_flow import execute_workflow
 
+# Run with DONOTUSEGEMINI unset, so keep any Gemini SDK use offline
+pytestmark = pytest.mark.usefixtures("no_network")
+
 class FakeQuotaError(Exception):
     pass
 
 
 def test_quota_error_triggers_stub(monkeypatch):
     # Ensure stub flag not set so workflow attempts normal path before fallback
-    import os
-    os.environ.pop("DONOTUSEGEMINI", None)
+    # (monkeypatch restores it afterwards, so later tests keep their stub mode)
+    monkeypatch.delenv("DONOTUSEGEMINI", raising=False)
     # Monkeypatch one agent to raise a quota-like error on call
     from src.agents.input_parser import InputParserAgent
 
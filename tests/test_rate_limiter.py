@@ -0,0 +1,85 @@
+from src.utils import rate_limiter
+from src.utils.rate_limiter import RateLimiter
+
+
+def test_token_sum_tracks_window(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: clock[0])
+    limiter = RateLimiter(rpm=100, tpm=1000, max_concurrency=10, jitter_ms=0)
+    limiter.acquire(300)
+    clock[0] += 10
+    limiter.acquire(200)
+    assert limiter._token_sum == 500
+
+    # First entry leaves the 60s window, then the second
+    limiter._purge(1065.0)
+    assert limiter._token_sum == 200
+    limiter._purge(1075.0)
+    assert limiter._token_sum == 0
+
+
+def test_tpm_wait_targets_earliest_sufficient_expiry(monkeypatch):
+    clock = [1000.0]
+    waits = []
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: clock[0])
+    limiter = RateLimiter(rpm=100, tpm=1000, max_concurrency=10, jitter_ms=0)
+    for _ in range(4):
+        limiter.acquire(250)
+        limiter.release()
+        clock[0] += 5
+
+    def fake_wait(timeout=None):
+        waits.append(timeout)
+        clock[0] += timeout
+
+    monkeypatch.setattr(limiter._cv, "wait", fake_wait)
+    # 1000 used; 400 more needs the first two entries (t=1000, t=1005) to expire
+    limiter.acquire(400)
+    assert waits and abs(waits[0] - (1065.0 - 1020.0)) < 1e-6
+
+
+def test_release_frees_concurrency_slot():
+    limiter = RateLimiter(rpm=100, tpm=1000, max_concurrency=1, jitter_ms=0)
+    with limiter:
+        assert limiter._in_flight == 1
+    assert limiter._in_flight == 0
+
+
+def test_release_wakes_blocked_acquire():
+    import threading
+    import time
+
+    limiter = RateLimiter(rpm=100, tpm=1000, max_concurrency=1, jitter_ms=0)
+    limiter.acquire(0)
+    acquired = threading.Event()
+
+    def waiter():
+        limiter.acquire(0)
+        acquired.set()
+
+    t = threading.Thread(target=waiter)
+    t.start()
+    time.sleep(0.05)
+    assert not acquired.is_set()
+
+    limiter.release()
+    assert acquired.wait(timeout=1.0)
+    t.join()
+    limiter.release()
+
+
+def test_acquire_async_woken_by_sync_release():
+    import asyncio
+    import threading
+
+    limiter = RateLimiter(rpm=100, tpm=1000, max_concurrency=1, jitter_ms=0)
+    limiter.acquire(0)
+
+    async def main():
+        threading.Timer(0.05, limiter.release).start()
+        await asyncio.wait_for(limiter.acquire_async(0), timeout=1.0)
+        assert limiter._in_flight == 1
+        await limiter.release_async()
+
+    asyncio.run(main())
+    assert limiter._in_flight == 0
@@ -0,0 +1,103 @@
+import pytest
+
+from src.utils import semantic_cache
+from src.utils.semantic_cache import SemanticCache
+
+
+class FakeEmbed:
+    """Embeds by topic keyword and counts how many texts it embedded."""
+
+    TOPICS = {"follow": [1.0, 0.0, 0.0], "thank": [0.0, 1.0, 0.0], "meeting": [0.0, 0.0, 1.0]}
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, texts):
+        self.calls += len(texts)
+        return [
+            next((vec for word, vec in self.TOPICS.items() if word in text), [0.5, 0.5, 0.5])
+            for text in texts
+        ]
+
+
+@pytest.fixture
+def embed():
+    return FakeEmbed()
+
+
+def test_exact_match_needs_no_embedding(embed):
+    cache = SemanticCache(embed, threshold=0.9)
+    cache.put("Follow up with John", "follow_up")
+    embedded = embed.calls
+
+    assert cache.get("  follow UP with   john ") == "follow_up"
+    assert embed.calls == embedded
+
+
+def test_similar_request_hits_and_dissimilar_misses(embed):
+    cache = SemanticCache(embed, threshold=0.9)
+    cache.put("follow up with John re: proposal", "follow_up")
+
+    assert cache.get("please follow up on the proposal") == "follow_up"
+    assert cache.get("thank Sarah for her help") is None
+
+
+def test_miss_then_put_embeds_the_key_once(embed):
+    cache = SemanticCache(embed, threshold=0.9)
+    cache.put("thank Sarah", "thank_you")
+    embed.calls = 0
+
+    value, vec = cache.get("set up a meeting", return_vec=True)
+    assert value is None and vec is not None
+    cache.put("set up a meeting", "meeting_request", vec=vec)
+
+    assert embed.calls == 1
+    assert cache.get("schedule a meeting with Tom") == "meeting_request"
+
+
+def test_entries_expire_after_ttl(embed, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache.time, "monotonic", lambda: now[0])
+    cache = SemanticCache(embed, threshold=0.9, ttl=60)
+    cache.put("follow up with John", "follow_up")
+
+    now[0] += 59
+    assert cache.get("follow up with John") == "follow_up"
+    now[0] += 2
+    assert cache.get("follow up with John") is None
+    assert cache.get("follow up on the proposal") is None
+
+
+def test_oldest_entry_is_evicted_beyond_max_entries():
+    cache = SemanticCache(None, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # refreshes "a", so "b" is now the oldest
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_threshold_of_one_disables_embedding(embed):
+    cache = SemanticCache(embed, threshold=1.0)
+    cache.put("follow up with John", "follow_up")
+
+    assert cache.get("follow up on the proposal") is None
+    assert embed.calls == 0
+
+
+def test_default_embedding_skips_hashed_fallback(monkeypatch):
+    from src.utils import vector_store
+
+    def no_gemini():
+        raise RuntimeError("Gemini disabled")
+
+    # No Gemini and no Chroma default model: only hashed vectors are left
+    monkeypatch.setattr(vector_store, "_get_genai", no_gemini)
+    monkeypatch.setattr(vector_store, "embedding_functions", None)
+    monkeypatch.setattr(semantic_cache, "_embed_fn", None)
+
+    assert semantic_cache._default_embed_fn() is None
+    [vec] = vector_store.GeminiEmbeddingFunction(hashed_fallback=False)(["hi there"])
+    assert list(vec) == [0.0]
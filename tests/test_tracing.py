@@ -0,0 +1,63 @@
+"""Generate one email with LangSmith tracing on and check the result.
+
+The workflow runs once per session (a 3-5s Gemini round-trip); every test
+asserts on that shared result. Run with ENABLE_LANGSMITH=true in .env, then
+check the dashboard at https://smith.langchain.com/ (project
+'email-generator') for traces around the printed timestamp. Marked
+``network``, so a plain ``pytest`` run deselects it:
+
+    pytest -m network tests/test_tracing.py
+    python tests/test_tracing.py
+"""
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+pytestmark = pytest.mark.network
+
+# Add project root to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.env import loaded_env
+
+# Bail out before importing the workflow (LangGraph/LangChain) when there is
+# no key to generate with
+if not loaded_env().get("GEMINI_API_KEY"):
+    if __name__ == "__main__":
+        sys.exit("GEMINI_API_KEY not set; skipping tracing test")
+    pytest.skip("GEMINI_API_KEY not set", allow_module_level=True)
+
+
+@pytest.fixture(scope="session")
+def traced_result():
+    """Result of a single traced generate_email run."""
+    from src.workflow.langgraph_flow import generate_email
+    from src.utils.observability import activate_langsmith
+
+    assert activate_langsmith(), "Failed to activate LangSmith"
+    # Printed so the trace can be found in the dashboard
+    print(f"\nLangSmith trace time: {datetime.now():%Y-%m-%d %H:%M:%S}")
+    return generate_email(
+        user_input="Write a thank you email to Sarah for helping with the project",
+        user_id="demo_user",
+        tone="professional",
+        developer_mode=False,
+        length_preference=100,
+    )
+
+
+def test_has_final_draft(traced_result):
+    assert traced_result.get("final_draft")
+
+
+def test_metadata_present(traced_result):
+    metadata = traced_result.get("metadata")
+    assert isinstance(metadata, dict)
+    assert metadata.get("source") in {"llm", "stub"}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-s", "-m", "network"]))
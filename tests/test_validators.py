@@ -0,0 +1,56 @@
+from src.utils.validators import DraftValidator, InputValidator
+
+
+def test_validate_email_accepts_common_addresses():
+    for email in ["john@techcorp.com", "a.b+tag@mail.example.co.uk", ""]:
+        assert InputValidator.validate_email(email) == (True, None)
+
+
+def test_validate_email_rejects_malformed_addresses():
+    for email in ["john", "john@", "john@corp", "john@corp.c", "john@corp.com\n"]:
+        valid, error = InputValidator.validate_email(email)
+        assert not valid
+        assert error == "Invalid email address format"
+
+
+def test_greeting_and_closing_match_whole_words():
+    assert DraftValidator.has_greeting("Hi Sarah,\n\nQuick note about the launch.")
+    assert DraftValidator.has_closing("...see you then.\n\nBest regards,\nJohn")
+    # "this" and "history" contain "hi" but are not greetings
+    assert not DraftValidator.has_greeting("I think this history matters.")
+
+
+def test_validate_draft_reports_each_issue():
+    body = " ".join(["word"] * 40)
+    valid, issues = DraftValidator.validate_draft(f"Dear Ana,\n\n{body}\n\nBest regards,\nJo")
+    assert valid and issues == []
+
+    filler = " ".join(["word"] * 20)
+    valid, issues = DraftValidator.validate_draft(f"Wow!!!! {filler}")
+    assert not valid
+    assert issues[0].startswith("Missing greeting")
+    assert issues[1].startswith("Missing closing")
+    assert issues[2].startswith("Email too short (21 words")
+    assert issues[3].startswith("Too many exclamation marks")
+
+
+def test_validate_draft_fails_fast_on_tiny_drafts():
+    valid, issues = DraftValidator.validate_draft("Wow!!!! short note")
+    assert not valid
+    assert issues == ["Email too short (3 words, minimum 30)"]
+
+
+def test_check_word_count_matches_split_near_bounds():
+    for n in (1, 29, 30, 31, 1000, 1001):
+        draft = "\n".join(["word"] * n)
+        assert DraftValidator.check_word_count(draft) == (n, 30 <= n <= 1000)
+    count, valid = DraftValidator.check_word_count(" ".join(["word"] * 5000))
+    assert not valid and count == 5000
+
+
+def test_check_word_count_ignores_repeated_whitespace():
+    assert DraftValidator.check_word_count("  ".join(["word"] * 602)) == (602, True)
+    indented = "\n".join("    " + " ".join(["word"] * 10) for _ in range(30))
+    assert DraftValidator.check_word_count(indented) == (300, True)
+    assert DraftValidator.check_word_count("Hello world.\n\nBest,\nJo\n") == (4, False)
+    assert DraftValidator.check_word_count("  Hi   there  \n\n") == (2, False)
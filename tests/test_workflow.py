@@ -0,0 +1,105 @@
+import threading
+
+import pytest
+
+from src.workflow import langgraph_flow
+from src.workflow.langgraph_flow import _graph_levels, default_graph_order, execute_workflow
+
+
+@pytest.fixture
+def cached_stub_agents(no_network, stub_llm, monkeypatch, tmp_path):
+    """Run the process-wide cached agents on the stub LLM, in a scratch cwd.
+
+    Profiles and memory files use relative paths, so they land in tmp_path.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(langgraph_flow, "_init_llm", lambda tier="default": stub_llm)
+    langgraph_flow._cached_agents.cache_clear()
+    langgraph_flow._cached_pipeline.cache_clear()
+    yield stub_llm
+    langgraph_flow._cached_agents.cache_clear()
+    langgraph_flow._cached_pipeline.cache_clear()
+
+
+def test_profile_saved_between_runs_reaches_cached_agents(cached_stub_agents):
+    from src.agents.personalization import PersonalizationAgent
+
+    llm = cached_stub_agents
+
+    request = "Write a thank you email to Sarah for the meeting"
+    first = execute_workflow(request, use_stub=False, user_id="alice")
+    assert first["user_profile"]["user_name"] == "User"
+
+    # Saved through a separate instance, as the users API does
+    profile = PersonalizationAgent(llm)._get_default_profile()
+    profile["user_name"] = "Alice Example"
+    PersonalizationAgent(llm).save_profile("alice", profile)
+
+    second = execute_workflow(request, use_stub=False, user_id="alice")
+    assert second["user_profile"]["user_name"] == "Alice Example"
+
+
+def test_graph_levels_run_independent_nodes_together():
+    assert _graph_levels(default_graph_order()) == [
+        ["input_parser", "profile_loader"],
+        ["intent_detector"],
+        ["draft_writer"],
+        ["tone_stylist"],
+        ["personalization"],
+        ["review"],
+        ["router"],
+    ]
+
+
+def test_graph_levels_resolve_missing_and_unknown_nodes():
+    # Without tone_stylist, personalization waits on what tone_stylist needed
+    order = ["input_parser", "profile_loader", "intent_detector", "draft_writer", "personalization"]
+    assert _graph_levels(order) == [
+        ["input_parser", "profile_loader"], ["intent_detector"], ["draft_writer"], ["personalization"],
+    ]
+    # A node without declared dependencies waits for every node before it
+    assert _graph_levels(["input_parser", "custom", "intent_detector"]) == [
+        ["input_parser"], ["custom", "intent_detector"],
+    ]
+
+
+def test_concurrent_nodes_merge_into_state(no_network, monkeypatch):
+    # Both first-level nodes must be running at once to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    seen = {}
+
+    def node(name, reads=(), **updates):
+        def run(state):
+            if name in ("input_parser", "profile_loader"):
+                barrier.wait()
+            seen[name] = {key: state.get(key) for key in reads}
+            return updates
+        return run
+
+    agents = {
+        "input_parser": node("input_parser", parsed_data={"recipient_name": "Sarah"}),
+        "profile_loader": node("profile_loader", user_profile={"user_name": "Alice"}),
+        "intent_detector": node("intent_detector", ("parsed_data",), intent="thank_you"),
+        "draft_writer": node("draft_writer", ("intent",), draft="Dear Sarah, thanks."),
+        "tone_stylist": node("tone_stylist", ("draft",), styled_draft="Dear Sarah, many thanks."),
+        "personalization": node(
+            "personalization", ("styled_draft", "user_profile"),
+            personalized_draft="Dear Sarah, many thanks. Alice",
+        ),
+        "review": node("review", ("personalized_draft",), final_draft="Dear Sarah, many thanks. Alice"),
+        "router": node("router"),
+    }
+    pipeline = langgraph_flow._build_pipeline(agents, default_graph_order())
+    monkeypatch.setattr(langgraph_flow, "_default_pipeline", lambda: pipeline)
+
+    state = execute_workflow("Thank Sarah", use_stub=False)
+
+    assert "review_notes" not in state
+    assert state["parsed_data"] == {"recipient_name": "Sarah"}
+    assert state["user_profile"] == {"user_name": "Alice"}
+    assert seen["intent_detector"] == {"parsed_data": {"recipient_name": "Sarah"}}
+    assert seen["personalization"] == {
+        "styled_draft": "Dear Sarah, many thanks.",
+        "user_profile": {"user_name": "Alice"},
+    }
+    assert state["final_draft"] == "Dear Sarah, many thanks. Alice"